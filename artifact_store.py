@@ -0,0 +1,349 @@
+"""
+Episode Artifact Store
+
+Content-addressed storage for episode artifacts. Every artifact (script,
+TTS script, audio) is written once as a blob under
+generated-episodes/.blobs/<aa>/<sha256>[.gz|.zst], deduplicated by content,
+and each episode's metadata.json references its artifacts by hash.
+
+Compression is chosen with ARTIFACT_COMPRESSION:
+- none (default)  blobs are stored as-is and the familiar per-episode files
+                  (script.txt, tts_script.txt, episode.mp3, showtext.txt)
+                  are written next to them: audio as hard links, so it is
+                  never stored twice, and the small text files as plain
+                  copies that can be edited
+- gzip / zstd     blobs are compressed and per-episode files are only
+                  produced on demand (see the export subcommand); zstd
+                  needs the optional zstandard package
+
+Writes are batched per episode and atomic: blobs and views are written to
+temporary files and renamed into place, and metadata.json is replaced
+last, so a crash never leaves an episode referencing missing data.
+
+Blobs are read-only, as hard-linked views share their inode: editing an
+episode's audio in place would otherwise change every episode that
+references the same content. Reads verify the blob against its hash.
+
+A view that no longer matches its blob (say, a hand-edited script.txt) is a
+user edit, not corruption: read_artifact stores it as a new blob and points
+metadata.json at it, so rerender picks the edit up.
+
+Blobs no longer referenced by any metadata.json (e.g. the previous audio
+of a re-rendered episode, or anything of a deleted episode folder) are
+removed by collect_garbage (the gc subcommand).
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+BLOB_DIR_NAME = ".blobs"
+METADATA_NAME = "metadata.json"
+
+# mkstemp creates private files; give stored files the usual permissions
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+BLOB_MODE = 0o444 & ~_UMASK
+
+# Views written as plain, writable copies instead of hard links, so they can be edited
+EDITABLE_VIEW_SUFFIXES = (".txt",)
+
+# Blobs younger than this are never collected: a batch in progress writes its
+# blobs before the metadata.json that references them
+GC_GRACE_SECONDS = 3600
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("ARTIFACT_COMPRESSION=zstd requires the zstandard package (pip install zstandard)")
+    return zstandard
+
+
+# name -> (blob suffix, compress, decompress)
+CODECS = {
+    "none": ("", lambda data: data, lambda data: data),
+    "gzip": (".gz", lambda data: gzip.compress(data, compresslevel=6), gzip.decompress),
+    "zstd": (
+        ".zst",
+        lambda data: _zstd().ZstdCompressor(level=10).compress(data),
+        lambda data: _zstd().ZstdDecompressor().decompress(data),
+    ),
+}
+
+
+def _atomic_write(path, data, mode=FILE_MODE):
+    """Write bytes to path via a temporary file and rename"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def write_json_atomic(path, data):
+    """Atomically write a JSON document"""
+    _atomic_write(path, json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8"))
+
+
+def showtext(metadata):
+    """showtext.txt content derived from metadata"""
+    return f"{metadata.get('episode_title', '')}\n{metadata.get('episode_description', '')}"
+
+
+class ArtifactStore:
+    """Blob store shared by every episode under one output directory"""
+
+    def __init__(self, root, compression="none"):
+        compression = (compression or "none").lower()
+        if compression not in CODECS:
+            raise ValueError(f"Unknown ARTIFACT_COMPRESSION: {compression} (use none, gzip or zstd)")
+        if compression == "zstd":
+            _zstd()
+        self.root = Path(root)
+        self.blob_dir = self.root / BLOB_DIR_NAME
+        self.compression = compression
+        self.write_views = compression == "none"
+
+    def blob_path(self, digest, compression=None):
+        """Location of a blob for a given codec (default: the store's codec)"""
+        suffix = CODECS[compression or self.compression][0]
+        return self.blob_dir / digest[:2] / f"{digest}{suffix}"
+
+    def find_blob(self, digest):
+        """Existing blob for a digest under any codec, as (path, codec) or (None, None)"""
+        for compression in (self.compression, *CODECS):
+            path = self.blob_path(digest, compression)
+            if path.exists():
+                return path, compression
+        return None, None
+
+    def put(self, data):
+        """Store bytes once; returns their sha256 digest"""
+        digest = hashlib.sha256(data).hexdigest()
+        if self.find_blob(digest)[0] is None:
+            _atomic_write(self.blob_path(digest), CODECS[self.compression][1](data), mode=BLOB_MODE)
+        return digest
+
+    def get(self, digest):
+        """Return the bytes for a digest, verified against it"""
+        path, compression = self.find_blob(digest)
+        if path is None:
+            raise FileNotFoundError(f"Missing blob {digest}")
+        data = CODECS[compression][2](path.read_bytes())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Blob {digest} is corrupt: its content no longer matches its hash")
+        return data
+
+    def load_metadata(self, episode_folder):
+        """metadata.json for an episode, or an empty dict"""
+        metadata_file = Path(episode_folder) / METADATA_NAME
+        if not metadata_file.exists():
+            return {}
+        with open(metadata_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def update_metadata(self, episode_folder, updates):
+        """Atomically merge updates into an episode's metadata.json"""
+        metadata = self.load_metadata(episode_folder)
+        metadata.update(updates)
+        write_json_atomic(Path(episode_folder) / METADATA_NAME, metadata)
+        return metadata
+
+    def has_artifact(self, episode_folder, name, metadata=None):
+        """Whether an episode has an artifact, as a view file or a blob reference"""
+        if metadata is None:
+            metadata = self.load_metadata(episode_folder)
+        return name in metadata.get("artifacts", {}) or (Path(episode_folder) / name).exists()
+
+    def read_artifact(self, episode_folder, name):
+        """Bytes of an episode artifact (or of a plain file from before the store).
+
+        An existing view wins over the blob: if it was edited, the edit is stored
+        as the artifact's new content (see adopt_view).
+        """
+        episode_folder = Path(episode_folder)
+        metadata = self.load_metadata(episode_folder)
+        ref = metadata.get("artifacts", {}).get(name)
+        view = episode_folder / name
+        if ref is None:
+            return view.read_bytes() if view.exists() else None
+        if not view.exists():
+            return self.get(ref["sha256"])
+        data = view.read_bytes()
+        if hashlib.sha256(data).hexdigest() != ref["sha256"]:
+            self.adopt_view(episode_folder, name, data)
+        elif name.endswith(EDITABLE_VIEW_SUFFIXES) and self._is_linked(view, ref["sha256"]):
+            # Hard link from before text views were copies: make it editable
+            self.link_view(episode_folder, name, ref["sha256"], data)
+        return data
+
+    def _is_linked(self, view, digest):
+        blob = self.find_blob(digest)[0]
+        return blob is not None and os.path.samefile(view, blob)
+
+    def adopt_view(self, episode_folder, name, data):
+        """Store an edited view as its artifact's new content"""
+        episode_folder = Path(episode_folder)
+        old_digest = self.load_metadata(episode_folder)["artifacts"][name]["sha256"]
+        if self._is_linked(episode_folder / name, old_digest):
+            # Edited through a hard link (after a chmod, or as root): the blob no
+            # longer holds the content its name promises, so it has to go
+            self.find_blob(old_digest)[0].unlink()
+        with self.batch(episode_folder) as batch:
+            batch.add(name, data)
+
+    def referenced_digests(self):
+        """Digests referenced by any metadata.json under the store root (variants included)"""
+        digests = set()
+        for metadata_file in self.root.rglob(METADATA_NAME):
+            if BLOB_DIR_NAME in metadata_file.relative_to(self.root).parts:
+                continue
+            try:
+                with open(metadata_file, "r", encoding="utf-8") as f:
+                    metadata = json.load(f)
+            except json.JSONDecodeError as e:
+                # Collecting without this episode's references could delete its data
+                raise ValueError(f"Unreadable {metadata_file}, not collecting garbage: {e}")
+            for ref in metadata.get("artifacts", {}).values():
+                digests.add(ref["sha256"])
+        return digests
+
+    def collect_garbage(self, dry_run=False, grace_seconds=GC_GRACE_SECONDS):
+        """Delete blobs no episode references; returns (blobs, bytes) removed"""
+        if not self.blob_dir.exists():
+            return 0, 0
+        referenced = self.referenced_digests()
+        cutoff = time.time() - grace_seconds
+        removed = freed = 0
+        for prefix_dir in sorted(self.blob_dir.iterdir()):
+            if not prefix_dir.is_dir():
+                continue
+            for blob in sorted(prefix_dir.iterdir()):
+                if blob.name.startswith(".") or blob.name.split(".")[0] in referenced:
+                    # Temporary files of in-flight writes, and live blobs
+                    continue
+                stat = blob.stat()
+                if stat.st_mtime > cutoff:
+                    continue
+                removed += 1
+                freed += stat.st_size
+                if not dry_run:
+                    blob.unlink()
+            if not dry_run and not any(prefix_dir.iterdir()):
+                prefix_dir.rmdir()
+        return removed, freed
+
+    def batch(self, episode_folder, fresh=False):
+        """Group an episode's writes into one atomic commit.
+
+        With fresh=True the episode's previous metadata is replaced rather than merged.
+        """
+        return ArtifactBatch(self, Path(episode_folder), fresh)
+
+    def link_view(self, episode_folder, name, digest, data=None):
+        """Expose a blob as a per-episode file, as a hard link where possible"""
+        view = episode_folder / name
+        blob, compression = self.find_blob(digest)
+        tmp = episode_folder / f".{name}.link.tmp"
+        if compression == "none" and not name.endswith(EDITABLE_VIEW_SUFFIXES):
+            if view.exists() and os.path.samefile(view, blob):
+                return view
+            try:
+                if tmp.exists():
+                    tmp.unlink()
+                if os.stat(blob).st_mode & 0o222:
+                    # Blob written before blobs were made read-only
+                    os.chmod(blob, BLOB_MODE)
+                os.link(blob, tmp)
+                os.replace(tmp, view)
+                return view
+            except OSError:
+                # File system without hard links: fall back to a copy
+                pass
+        _atomic_write(view, data if data is not None else self.get(digest))
+        return view
+
+    def export(self, episode_folder):
+        """Materialize every per-episode file for an episode; returns the paths written"""
+        episode_folder = Path(episode_folder)
+        metadata = self.load_metadata(episode_folder)
+        written = []
+        for name, ref in metadata.get("artifacts", {}).items():
+            written.append(self.link_view(episode_folder, name, ref["sha256"]))
+        if metadata.get("episode_title"):
+            view = episode_folder / "showtext.txt"
+            _atomic_write(view, showtext(metadata).encode("utf-8"))
+            written.append(view)
+        return written
+
+
+class ArtifactBatch:
+    """Pending artifacts and metadata updates for one episode"""
+
+    def __init__(self, store, episode_folder, fresh=False):
+        self.store = store
+        self.episode_folder = episode_folder
+        self.fresh = fresh
+        self.artifacts = {}
+        self.metadata_updates = {}
+
+    def add(self, name, data):
+        """Queue an artifact; text is stored as UTF-8"""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.artifacts[name] = data
+
+    def update_metadata(self, updates):
+        """Queue metadata.json updates"""
+        self.metadata_updates.update(updates)
+
+    def commit(self):
+        """Write blobs, then views, then metadata.json"""
+        self.episode_folder.mkdir(parents=True, exist_ok=True)
+        metadata = {} if self.fresh else self.store.load_metadata(self.episode_folder)
+        artifacts = dict(metadata.get("artifacts", {}))
+
+        for name, data in self.artifacts.items():
+            digest = self.store.put(data)
+            artifacts[name] = {"sha256": digest, "size": len(data)}
+
+        metadata.update(self.metadata_updates)
+        metadata["artifacts"] = artifacts
+
+        for name, data in self.artifacts.items():
+            view = self.episode_folder / name
+            if self.store.write_views:
+                self.store.link_view(self.episode_folder, name, artifacts[name]["sha256"], data)
+            elif view.exists():
+                # A stale plain copy would shadow the new blob
+                view.unlink()
+
+        showtext_file = self.episode_folder / "showtext.txt"
+        if self.store.write_views and metadata.get("episode_title"):
+            _atomic_write(showtext_file, showtext(metadata).encode("utf-8"))
+        elif showtext_file.exists() and "episode_title" in self.metadata_updates:
+            showtext_file.unlink()
+
+        write_json_atomic(self.episode_folder / METADATA_NAME, metadata)
+        return metadata
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        return False
@@ -0,0 +1,143 @@
+"""
+Episode Duration Prediction
+
+Predicts how long an episode will play from its TTS script before any
+audio is synthesized, so that scripts far outside the target length can be
+trimmed or regenerated instead of being sent to the (expensive) TTS stage.
+
+The speaking rate is calibrated from past episodes: words in their TTS
+script against the audio duration recorded in their metadata.json. Until
+enough episodes have audio, a typical rate of 150 words per minute is used
+and the target window is widened by UNCALIBRATED_TOLERANCE: at that rate the
+system prompt's ~1,200 words land exactly on the 8 minute lower edge, so a
+slightly short script would otherwise be regenerated for a guessed rate.
+Every new episode stores its predicted and actual duration, so the rate
+keeps improving.
+
+The target window comes from TARGET_MINUTES (default "8-10").
+"""
+
+import os
+
+DEFAULT_WORDS_PER_SECOND = 2.5
+MIN_CALIBRATION_EPISODES = 3
+DEFAULT_TARGET_MINUTES = "8-10"
+
+# Fraction the target window is widened by on both sides until the rate is calibrated
+UNCALIBRATED_TOLERANCE = 0.2
+
+# Scripts at most this much over the limit are trimmed; longer ones are regenerated
+MAX_TRIM_FRACTION = 0.25
+
+
+def count_words(tts_script):
+    """Spoken words in a normalized TTS script (speaker tags excluded)"""
+    return sum(len(segment.split()) for segment in tts_script["segments"])
+
+
+def parse_target(spec):
+    """(min_seconds, max_seconds) from a "min-max" minutes range"""
+    low, _, high = (spec or DEFAULT_TARGET_MINUTES).partition("-")
+    try:
+        low, high = float(low), float(high or low)
+    except ValueError:
+        raise ValueError(f"TARGET_MINUTES must look like 8-10, got: {spec}")
+    if low <= 0 or high < low:
+        raise ValueError(f"TARGET_MINUTES must be a positive range, got: {spec}")
+    return low * 60, high * 60
+
+
+def format_duration(seconds):
+    """Minutes and seconds, e.g. 9m 05s"""
+    return f"{int(seconds // 60)}m {int(seconds % 60):02d}s"
+
+
+class DurationPredictor:
+    """Words-per-second model fitted to past episodes"""
+
+    OK = "ok"
+    TOO_SHORT = "too_short"
+    TOO_LONG = "too_long"
+
+    def __init__(self, target=None):
+        self.min_seconds, self.max_seconds = parse_target(target or os.environ.get("TARGET_MINUTES"))
+        self.samples = []
+        self.words_per_second = DEFAULT_WORDS_PER_SECOND
+
+    def calibrate(self, samples):
+        """Fit the speaking rate to (words, audio_seconds) pairs"""
+        self.samples = [(words, seconds) for words, seconds in samples if words and seconds]
+        self._fit()
+        return self
+
+    def add_sample(self, words, seconds):
+        """Add a newly rendered episode and refit"""
+        if words and seconds:
+            self.samples.append((words, seconds))
+            self._fit()
+
+    def _fit(self):
+        if len(self.samples) < MIN_CALIBRATION_EPISODES:
+            self.words_per_second = DEFAULT_WORDS_PER_SECOND
+            return
+        # Least squares for seconds = words / rate, through the origin
+        seconds_per_word = (
+            sum(words * seconds for words, seconds in self.samples)
+            / sum(words * words for words, _ in self.samples)
+        )
+        self.words_per_second = 1 / seconds_per_word
+
+    @property
+    def calibrated(self):
+        return len(self.samples) >= MIN_CALIBRATION_EPISODES
+
+    def predict(self, words):
+        """Predicted audio duration in seconds"""
+        return words / self.words_per_second
+
+    def bounds(self):
+        """(min_seconds, max_seconds) scripts are checked against, widened until calibrated"""
+        if self.calibrated:
+            return self.min_seconds, self.max_seconds
+        return self.min_seconds * (1 - UNCALIBRATED_TOLERANCE), self.max_seconds * (1 + UNCALIBRATED_TOLERANCE)
+
+    def check(self, words):
+        """OK, TOO_SHORT or TOO_LONG for a script of this many words"""
+        predicted = self.predict(words)
+        min_seconds, max_seconds = self.bounds()
+        if predicted < min_seconds:
+            return self.TOO_SHORT
+        if predicted > max_seconds:
+            return self.TOO_LONG
+        return self.OK
+
+    def miss(self, words):
+        """Seconds a script of this many words falls outside the checked window (0 if inside)"""
+        predicted = self.predict(words)
+        min_seconds, max_seconds = self.bounds()
+        return max(min_seconds - predicted, predicted - max_seconds, 0.0)
+
+    def trimmable(self, words):
+        """Whether an overlong script is close enough to the limit to trim"""
+        return self.predict(words) <= self.bounds()[1] * (1 + MAX_TRIM_FRACTION)
+
+    def describe(self):
+        """Rate and target for the run log"""
+        source = f"fitted to {len(self.samples)} episodes" if self.calibrated else "default"
+        min_seconds, max_seconds = self.bounds()
+        tolerance = "" if self.calibrated else f", checked {format_duration(min_seconds)}-{format_duration(max_seconds)} until calibrated"
+        return (
+            f"{self.words_per_second * 60:.0f} words/min ({source}), "
+            f"target {format_duration(self.min_seconds)}-{format_duration(self.max_seconds)}{tolerance}"
+        )
+
+    def summary(self, words, actual_seconds=None):
+        """Duration block stored in an episode's metadata.json"""
+        return {
+            "words": words,
+            "predicted_seconds": round(self.predict(words), 1),
+            "actual_seconds": round(actual_seconds, 1) if actual_seconds else None,
+            "words_per_second": round(self.words_per_second, 4),
+            "calibration_episodes": len(self.samples) if self.calibrated else 0,
+            "target_seconds": [round(self.min_seconds), round(self.max_seconds)],
+        }
@@ -0,0 +1,188 @@
+"""
+Offline Gemini Backend
+
+A deterministic stand-in for genai.Client, used with `--fake`. It answers
+the same calls the generator makes (generate_content_stream for text and
+TTS, generate_content for repairs) without network access or an API key:
+- text: a structured episode of about 1,200 words, derived from a hash of
+  the prompt, with the markdown, numbers and abbreviations real
+  transcripts contain, as a transcript or as dialogue turns
+- audio: silent 24 kHz 16-bit PCM streamed in chunks, sized like real
+  speech for the text (about 2.5 words per second)
+
+The same prompt always produces the same episode and the same audio, so
+profiles and timings of offline runs are comparable. FAKE_BACKEND_LATENCY
+adds a delay (seconds) before every streamed chunk to imitate the network.
+"""
+
+import hashlib
+import json
+import os
+import random
+import time
+from types import SimpleNamespace
+
+FAKE_WORDS_PER_SECOND = 2.5
+FAKE_SAMPLE_RATE = 24000
+FAKE_AUDIO_MIME_TYPE = f"audio/L16;codec=pcm;rate={FAKE_SAMPLE_RATE}"
+FAKE_AUDIO_CHUNK_SECONDS = 1.0
+FAKE_TEXT_CHUNK_CHARS = 400
+FAKE_EPISODE_WORDS = 1200
+AUDIO_TOKENS_PER_SECOND = 25
+
+VOCABULARY = (
+    "model network latency token context window GPU inference training dataset "
+    "benchmark cache memory throughput prompt agent API protocol server client "
+    "encryption firewall router packet bandwidth storage index query vector "
+    "embedding pipeline deployment container cluster scheduler compiler kernel"
+).split()
+
+FILLER = (
+    "the a of to and in that is for it as with on this you can which "
+    "really actually basically so when how what more most because"
+).split()
+
+# Sentence templates that exercise the TTS normalizer
+FLOURISHES = (
+    "**Here's the key point:** it matters more than you'd think.",
+    "Around 2024 the price dropped to $20/month, roughly 35% less than before.",
+    "You'll see this in A.I. tools e.g. ChatGPT, Gemini, and so on.",
+    "On the 3rd attempt it ran 24/7 at 1,500 requests per second.",
+    "- One: check the docs at https://example.com/docs before you start.",
+    "Think of it like a donkey's guide to `config.yaml` files.",
+)
+
+
+def _usage(prompt_tokens, output_tokens):
+    return SimpleNamespace(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=output_tokens,
+        thoughts_token_count=0,
+    )
+
+
+def _request_text(contents):
+    """Concatenated text parts of a request"""
+    return "\n".join(
+        part.text
+        for content in contents
+        for part in (content.parts or [])
+        if getattr(part, "text", None)
+    )
+
+
+def _rng(text):
+    return random.Random(int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:16], 16))
+
+
+def fake_sentence(rng):
+    """One plausible-looking sentence"""
+    if rng.random() < 0.08:
+        return rng.choice(FLOURISHES)
+    words = [rng.choice(VOCABULARY if rng.random() < 0.4 else FILLER) for _ in range(rng.randint(8, 18))]
+    return " ".join(words).capitalize() + rng.choice((".", ".", ".", "?", "!"))
+
+
+def fake_paragraphs(rng, words=FAKE_EPISODE_WORDS):
+    """Paragraphs of fake sentences totalling about the given number of words"""
+    paragraphs = []
+    total = 0
+    while total < words:
+        paragraph = " ".join(fake_sentence(rng) for _ in range(rng.randint(3, 6)))
+        paragraphs.append(paragraph)
+        total += len(paragraph.split())
+    return paragraphs
+
+
+def fake_episode(prompt, fields, speakers):
+    """Structured episode for a prompt, with the requested fields"""
+    rng = _rng(prompt)
+    topic = " ".join(prompt.split()[:6]) or "Nothing In Particular"
+    paragraphs = fake_paragraphs(rng)
+    episode = {
+        "episode_title": f"Offline Episode: {topic}",
+        "episode_description": f"In this episode, Herman answers Daniel's question about {topic.lower()}.",
+    }
+    if "episode_turns" in fields:
+        episode["episode_turns"] = [
+            {"speaker": speakers[index % len(speakers)], "text": paragraph}
+            for index, paragraph in enumerate(paragraphs)
+        ]
+    else:
+        episode["episode_transcript"] = "\n\n".join(paragraphs)
+    return {field: episode[field] for field in fields if field in episode}
+
+
+def _schema_fields(config):
+    schema = getattr(config, "response_schema", None)
+    return list(getattr(schema, "properties", None) or {})
+
+
+def _schema_speakers(config):
+    schema = getattr(config, "response_schema", None)
+    turns = (getattr(schema, "properties", None) or {}).get("episode_turns")
+    speaker = getattr(getattr(turns, "items", None), "properties", {}).get("speaker") if turns else None
+    return list(getattr(speaker, "enum", None) or ["Herman", "Corn"])
+
+
+class FakeModels:
+    """The client.models surface used by the generator"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def _pause(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def generate_content_stream(self, model, contents, config=None):
+        if getattr(config, "response_modalities", None):
+            return self._stream_audio(contents)
+        return self._stream_text(contents, config)
+
+    def generate_content(self, model, contents, config=None):
+        prompt = _request_text(contents)
+        text = json.dumps(fake_episode(prompt, _schema_fields(config), _schema_speakers(config)))
+        return SimpleNamespace(text=text, candidates=None, usage_metadata=_usage(len(prompt) // 4, len(text) // 4))
+
+    def _stream_text(self, contents, config):
+        prompt = _request_text(contents)
+        text = json.dumps(fake_episode(prompt, _schema_fields(config), _schema_speakers(config)))
+        for start in range(0, len(text), FAKE_TEXT_CHUNK_CHARS):
+            self._pause()
+            yield SimpleNamespace(
+                text=text[start:start + FAKE_TEXT_CHUNK_CHARS],
+                candidates=None,
+                usage_metadata=_usage(len(prompt) // 4, start // 4),
+            )
+
+    def _stream_audio(self, contents):
+        text = _request_text(contents)
+        seconds = len(text.split()) / FAKE_WORDS_PER_SECOND
+        total_bytes = int(seconds * FAKE_SAMPLE_RATE) * 2
+        chunk_bytes = int(FAKE_AUDIO_CHUNK_SECONDS * FAKE_SAMPLE_RATE) * 2
+        for start in range(0, total_bytes, chunk_bytes):
+            self._pause()
+            data = bytes(min(chunk_bytes, total_bytes - start))
+            yield SimpleNamespace(
+                text=None,
+                candidates=[SimpleNamespace(content=SimpleNamespace(parts=[
+                    SimpleNamespace(inline_data=SimpleNamespace(data=data, mime_type=FAKE_AUDIO_MIME_TYPE)),
+                ]))],
+                usage_metadata=_usage(len(text) // 4, 0),
+            )
+        # Like the real API, the complete usage arrives in a final chunk without content
+        yield SimpleNamespace(
+            text=None,
+            candidates=[SimpleNamespace(content=None)],
+            usage_metadata=_usage(len(text) // 4, round(seconds * AUDIO_TOKENS_PER_SECOND)),
+        )
+
+
+class FakeClient:
+    """Drop-in replacement for genai.Client"""
+
+    def __init__(self, latency=None):
+        if latency is None:
+            latency = float(os.environ.get("FAKE_BACKEND_LATENCY") or 0)
+        self.models = FakeModels(latency)
@@ -0,0 +1,218 @@
+"""
+Pooled Gemini Transport
+
+A shared httpx client tuned for many concurrent Gemini calls, handed to
+genai.Client so that every stage and worker reuses the same connections:
+- keep-alive connection pool (all traffic goes to one API host, so the
+  pool limits are effectively per-host limits)
+- HTTP/2 multiplexing when the optional h2 package is installed
+- pre-warming, so the first calls of a run skip TCP/TLS setup
+- timeouts split into connect, first-byte (until response headers) and
+  idle-stream (longest gap between streamed chunks); waiting for a free
+  pooled connection counts against the first-byte budget, because TTS
+  streams hold their connection for minutes. TTS calls get much longer
+  limits than text calls, since a whole episode script is rendered in one
+  request. Override with GEMINI_FIRST_BYTE_TIMEOUT, GEMINI_IDLE_TIMEOUT,
+  GEMINI_TTS_FIRST_BYTE_TIMEOUT and GEMINI_TTS_IDLE_TIMEOUT (seconds, or
+  "none" for no limit)
+- stats: open connections, reuse ratio, handshake and first-byte times
+"""
+
+import os
+import threading
+import time
+
+import httpx
+
+GEMINI_HOST = "generativelanguage.googleapis.com"
+
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_KEEPALIVE_EXPIRY = 120.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_FIRST_BYTE_TIMEOUT = 120.0
+DEFAULT_IDLE_STREAM_TIMEOUT = 60.0
+DEFAULT_TTS_FIRST_BYTE_TIMEOUT = 900.0
+DEFAULT_TTS_IDLE_STREAM_TIMEOUT = 300.0
+DEFAULT_WRITE_TIMEOUT = 30.0
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def timeout_from_env(name, default):
+    """Timeout in seconds from an environment variable; "none" (or 0) means no limit"""
+    value = os.environ.get(name, "").strip().lower()
+    if not value:
+        return default
+    if value in ("none", "off", "0"):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number of seconds or \"none\", got: {value}")
+
+
+def is_tts_request(request):
+    """Whether a request goes to a TTS model (models/<name>-tts:streamGenerateContent)"""
+    return "-tts:" in request.url.path
+
+
+class PooledTransport:
+    """Owns the pooled httpx client and collects connection statistics"""
+
+    def __init__(
+        self,
+        max_connections=DEFAULT_MAX_CONNECTIONS,
+        keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        first_byte_timeout=None,
+        idle_stream_timeout=None,
+        tts_first_byte_timeout=None,
+        tts_idle_stream_timeout=None,
+        write_timeout=DEFAULT_WRITE_TIMEOUT,
+        http2=None,
+    ):
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self.max_connections = max_connections
+        self.connect_timeout = connect_timeout
+        self.write_timeout = write_timeout
+        # (first byte, idle stream) limits for text and TTS calls; None is unlimited
+        self.text_timeouts = (
+            first_byte_timeout or timeout_from_env("GEMINI_FIRST_BYTE_TIMEOUT", DEFAULT_FIRST_BYTE_TIMEOUT),
+            idle_stream_timeout or timeout_from_env("GEMINI_IDLE_TIMEOUT", DEFAULT_IDLE_STREAM_TIMEOUT),
+        )
+        self.tts_timeouts = (
+            tts_first_byte_timeout or timeout_from_env("GEMINI_TTS_FIRST_BYTE_TIMEOUT", DEFAULT_TTS_FIRST_BYTE_TIMEOUT),
+            tts_idle_stream_timeout or timeout_from_env("GEMINI_TTS_IDLE_TIMEOUT", DEFAULT_TTS_IDLE_STREAM_TIMEOUT),
+        )
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._requests = 0
+        self._new_connections = 0
+        self._handshake_seconds = []
+        self._first_byte_seconds = []
+
+        self.http_client = httpx.Client(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=self._timeouts(self.text_timeouts[0]),
+            event_hooks={"request": [self._on_request], "response": [self._on_response]},
+        )
+
+    def _timeouts(self, first_byte_timeout):
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=first_byte_timeout,
+            write=self.write_timeout,
+            pool=first_byte_timeout,
+        )
+
+    def timeouts_for(self, request):
+        """(first byte, idle stream) limits for a request"""
+        return self.tts_timeouts if is_tts_request(request) else self.text_timeouts
+
+    def _on_request(self, request):
+        # The SDK passes its own (usually unlimited) timeout per request, so
+        # ours are applied here. Until headers arrive, "read" is the first-byte timeout.
+        request.extensions["timeout"] = self._timeouts(self.timeouts_for(request)[0]).as_dict()
+        request.extensions["trace"] = self._trace
+        self._local.request_started = time.perf_counter()
+
+    def _on_response(self, response):
+        # Headers are in: from here on "read" bounds the gap between streamed chunks
+        response.request.extensions["timeout"]["read"] = self.timeouts_for(response.request)[1]
+        started = getattr(self._local, "request_started", None)
+        if started is not None:
+            with self._lock:
+                self._first_byte_seconds.append(time.perf_counter() - started)
+
+    def _trace(self, event_name, info):
+        """httpcore trace callback, used to count requests and time new TCP/TLS handshakes"""
+        if event_name.endswith("send_request_headers.started"):
+            # Only sent once a connection was acquired, so pool timeouts are not counted
+            with self._lock:
+                self._requests += 1
+        elif event_name == "connection.connect_tcp.started":
+            self._local.handshake_started = time.perf_counter()
+        elif event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._new_connections += 1
+        elif event_name == "connection.start_tls.complete":
+            started = getattr(self._local, "handshake_started", None)
+            if started is not None:
+                with self._lock:
+                    self._handshake_seconds.append(time.perf_counter() - started)
+            self._local.handshake_started = None
+
+    def prewarm(self, connections=2):
+        """Open connections to the API host ahead of the first real call"""
+        connections = min(connections, self.max_connections)
+        if self.http2:
+            # A single HTTP/2 connection multiplexes every request
+            connections = 1
+
+        def warm():
+            try:
+                self.http_client.head(f"https://{GEMINI_HOST}/")
+            except httpx.HTTPError:
+                pass
+
+        with self._lock:
+            requests, first_bytes = self._requests, len(self._first_byte_seconds)
+        threads = [threading.Thread(target=warm) for _ in range(connections)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with self._lock:
+            # Warm-up requests are not real calls; only their connections count
+            self._requests = requests
+            del self._first_byte_seconds[first_bytes:]
+        print(f"🔌 Pre-warmed {self.open_connections()} connection(s) to {GEMINI_HOST}")
+
+    def open_connections(self):
+        """Connections currently held by the pool"""
+        pool = getattr(getattr(self.http_client, "_transport", None), "_pool", None)
+        return len(getattr(pool, "connections", []))
+
+    def stats(self):
+        """Snapshot of pool usage"""
+        with self._lock:
+            requests = self._requests
+            new_connections = self._new_connections
+            handshakes = list(self._handshake_seconds)
+            first_bytes = list(self._first_byte_seconds)
+        return {
+            "http2": self.http2,
+            "open_connections": self.open_connections(),
+            "requests": requests,
+            "new_connections": new_connections,
+            "reuse_ratio": round(max(0.0, 1 - new_connections / requests), 3) if requests else None,
+            "avg_handshake_ms": round(1000 * sum(handshakes) / len(handshakes), 1) if handshakes else None,
+            "avg_first_byte_ms": round(1000 * sum(first_bytes) / len(first_bytes), 1) if first_bytes else None,
+        }
+
+    def print_stats(self):
+        """One-line pool summary for the run log"""
+        stats = self.stats()
+        if not stats["requests"]:
+            return
+        reuse = f"{stats['reuse_ratio']:.0%}" if stats["reuse_ratio"] is not None else "n/a"
+        handshake = f"{stats['avg_handshake_ms']} ms" if stats["avg_handshake_ms"] is not None else "n/a"
+        print(
+            f"🔌 Connections: {stats['requests']} requests over {stats['new_connections']} new connection(s), "
+            f"reuse {reuse}, avg handshake {handshake}, {stats['open_connections']} open"
+            f"{' (HTTP/2)' if stats['http2'] else ''}"
+        )
+
+    def close(self):
+        """Close all pooled connections"""
+        self.http_client.close()
@@ -6,41 +6,298 @@ This script processes prompts from the prompts/ folder through a two-stage workf
 1. Generate episode text using Gemini 2.5 Flash
 2. Create audio using Gemini TTS Flash Preview
 
+Between the stages the transcript is normalized for speech (see tts_normalizer.py)
+and its duration is predicted (see duration_predictor.py): scripts outside the
+target length are trimmed or regenerated before any audio is synthesized.
+
+Usage:
+  python generate_episodes.py run         process every prompt in prompts/
+  python generate_episodes.py status      pending prompts, episodes and spend
+  python generate_episodes.py list        generated episodes
+  python generate_episodes.py rerender X  redo the audio for episode X from its script
+  python generate_episodes.py variants X  render other voices/languages of episode X
+  python generate_episodes.py gc          delete stored artifacts no episode uses
+  python generate_episodes.py bench       check that CLI startup stays fast
+
+  python generate_episodes.py export X    write episode X's files from the artifact store
+
+  run/rerender --fake     use the offline backend (fake_backend.py), no API key needed
+  export/gc --fake        work on the offline backend's fake-episodes/ instead
+  run/rerender --profile  profile every stage of every episode (see profiling.py)
+
 Episodes are saved in generated-episodes/ with the following structure:
 - episode-title/
   - episode.mp3
   - script.txt
+  - tts_script.txt
   - showtext.txt
   - metadata.json
+  - variants/<language>-<voice>/   the same files for each variant (optional)
+
+Variants (e.g. --variant-voice Puck --language en --language he) are rendered
+from the episode's single text generation: each language is translated once
+and every variant is synthesized concurrently with the main episode's audio.
+
+Artifacts are stored once in a content-addressed store (see artifact_store.py);
+with ARTIFACT_COMPRESSION=gzip or zstd only metadata.json is kept per episode
+and the other files are produced on demand by the export subcommand.
 """
 
+import argparse
 import json
 import os
 import re
 import mimetypes
 import struct
+import subprocess
+import sys
+import time
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
-from google import genai
-from google.genai import types
+from tts_normalizer import normalize_for_tts, content_hash, NORMALIZER_VERSION
+from concurrent.futures import ThreadPoolExecutor
+from artifact_store import ArtifactStore
+from usage_accounting import UsageTracker, BudgetScheduler, USAGE_LOG_NAME
+from duration_predictor import DurationPredictor, count_words, format_duration
+
+# The Gemini SDK (and the live stream server) are slow to import, so they are
+# only imported inside the methods that use them. Subcommands that do no
+# network work never load them.
+
+# Offline runs are kept apart from real episodes and their spend log
+FAKE_OUTPUT_DIR = "fake-episodes"
+
+EPISODE_FIELDS = ("episode_title", "episode_description", "episode_transcript")
+
+DEFAULT_TEXT_MODEL = "gemini-2.5-flash"
+DEFAULT_TTS_MODEL = "gemini-2.5-pro-preview-tts"
+
+# Speakers and their prebuilt TTS voices; the first speaker hosts monologue episodes.
+# Override with HOST_VOICES="Herman=Sadaltager,Corn=Enceladus".
+DEFAULT_VOICES = {"Herman": "Sadaltager", "Corn": "Enceladus"}
+
+# Episodes are synthesized in concurrent groups of segments (or dialogue turns) of about this size
+TTS_GROUP_CHARS = 2500
+MAX_TTS_WORKERS = 4
+
+# Episode variants: other voices and languages rendered from one text generation
+SOURCE_LANGUAGE = "en"
+VARIANTS_DIR_NAME = "variants"
+MAX_VARIANT_WORKERS = 4
+
+# Most Gemini calls in flight at once: TTS groups of the main episode and of every
+# concurrent variant, plus the variants' translations. Sizes the connection pool.
+MAX_CONCURRENT_CALLS = MAX_TTS_WORKERS * (1 + MAX_VARIANT_WORKERS) + MAX_VARIANT_WORKERS
+LANGUAGE_NAMES = {
+    "ar": "Arabic", "de": "German", "en": "English", "es": "Spanish", "fr": "French",
+    "he": "Hebrew", "it": "Italian", "ja": "Japanese", "pt": "Portuguese", "ru": "Russian",
+    "zh": "Chinese",
+}
+
+TRANSLATION_INSTRUCTIONS = """Translate this podcast episode into {language}. Keep its meaning, structure,
+tone and humor, adapting idioms rather than translating them word for word. Keep speaker names
+unchanged. The text will be read by a TTS engine: write plain text, with numbers, dates and
+symbols spelled out as words. Return the same fields you are given."""
+
+DIALOGUE_FIELDS = ("episode_title", "episode_description", "episode_turns")
+
+DIALOGUE_INSTRUCTIONS = """Dialogue mode: this episode is a conversation between two hosts, {host} and {cohost}.
+{host} (Herman Poppleberry, the donkey) leads the show and does most of the explaining.
+{cohost} (Herman's brother, the sloth) asks the questions a curious listener would ask,
+adds dry humor, and occasionally summarizes. Alternate naturally between the two; keep
+each turn to a few sentences. Instead of episode_transcript, return episode_turns: an
+ordered list of turns, each with "speaker" (exactly "{host}" or "{cohost}") and "text"
+(plain text, exactly as it should be spoken)."""
+
+# Prompt files named like "topic.low.txt" or "topic.high.txt" set their priority
+PROMPT_PRIORITIES = {"high": 0, "normal": 1, "low": 2}
 
-# Load environment variables from .env file
-load_dotenv()
+# Full text generations allowed per prompt when the transcript is unrecoverable
+MAX_TEXT_ATTEMPTS = 2
+
+# Scripts generated per prompt when the predicted duration is outside the target
+MAX_LENGTH_ATTEMPTS = 2
+
+LENGTH_NOTE = """
+
+(Note: a previous draft for this prompt would have run {predicted} ({words} words). \
+The episode must run {target}, which is about {target_words} words.)"""
+
+# Structured-output repair helpers
+LENIENT_JSON_DECODER = json.JSONDecoder(strict=False)
+JSON_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+INVALID_ESCAPE_RE = re.compile(r'\\(?=[^"\\/bfnrtu])')
+FIELD_KEY_PATTERN = r'"{field}"\s*:\s*"'
+TURN_PATTERN = re.compile(r'"speaker"\s*:\s*"([^"]*)"\s*,\s*"text"\s*:\s*"')
+# End of a sentence, including closing quotes or brackets
+SENTENCE_END_RE = re.compile(r'[.!?…]["\'”’)\]]*(?=\s|$)')
 
 
 class PodcastGenerator:
-    def __init__(self):
-        self.api_key = os.environ.get("GEMINI_API_KEY")
-        if not self.api_key:
-            raise ValueError("GEMINI_API_KEY environment variable not set")
-        
-        self.client = genai.Client(api_key=self.api_key)
+    def __init__(self, stream_port=None, dialogue=None, voices=None, fake=False, profiler=None,
+                 variant_voices=None, languages=None):
+        self._client = None
+        self.transport = None
+        self.fake = fake
+        self.profiler = profiler
         self.prompts_dir = Path("prompts")
-        self.output_dir = Path("generated-episodes")
+        self.output_dir = Path(FAKE_OUTPUT_DIR if fake else "generated-episodes")
+        self.text_model = DEFAULT_TEXT_MODEL
+        self.tts_model = DEFAULT_TTS_MODEL
+        self.dialogue = dialogue if dialogue is not None else os.environ.get("PODCAST_MODE", "").lower() == "dialogue"
+        self.voices = self.parse_voices(voices or os.environ.get("HOST_VOICES"))
+        self.host = next(iter(self.voices))
+        if self.dialogue and len(self.voices) != 2:
+            # Multi-speaker TTS takes exactly two speakers, the host and the co-host
+            raise ValueError(
+                f"Dialogue mode needs exactly two speakers (--voice Host=Voice --voice CoHost=Voice), "
+                f"got: {', '.join(self.voices)}"
+            )
+        
+        # Extra voices/languages rendered for every episode (see parse_variants)
+        self.variants = self.parse_variants(
+            variant_voices or os.environ.get("VARIANT_VOICES"),
+            languages or os.environ.get("VARIANT_LANGUAGES"),
+        )
         
         # Ensure output directory exists
         self.output_dir.mkdir(exist_ok=True)
+        
+        # Content-addressed storage for transcripts and audio
+        self.store = ArtifactStore(self.output_dir, compression=os.environ.get("ARTIFACT_COMPRESSION"))
+        
+        # Token/cost accounting and budget enforcement
+        self.usage = UsageTracker(self.output_dir / USAGE_LOG_NAME)
+        self.scheduler = BudgetScheduler(self.usage)
+        
+        # Pre-TTS length check, calibrated from past episodes (see calibrate_durations)
+        self.durations = DurationPredictor()
+        
+        # Optional live playback of episodes while they are synthesized
+        if stream_port is None and os.environ.get("LIVE_STREAM_PORT"):
+            stream_port = int(os.environ["LIVE_STREAM_PORT"])
+        self.stream_port = stream_port
+        self.live_server = None
+    
+    @property
+    def client(self):
+        """Gemini client, created on first use by a network stage"""
+        if self._client is None and self.fake:
+            from fake_backend import FakeClient
+            print("🧪 Using the offline fake backend")
+            self._client = FakeClient()
+        if self._client is None:
+            api_key = os.environ.get("GEMINI_API_KEY")
+            if not api_key:
+                raise ValueError("GEMINI_API_KEY environment variable not set")
+            from google import genai
+            from google.genai import types
+            from gemini_transport import PooledTransport
+            # One pooled transport shared by every stage and worker
+            self.transport = PooledTransport(max_connections=MAX_CONCURRENT_CALLS)
+            self._client = genai.Client(
+                api_key=api_key,
+                http_options=types.HttpOptions(httpx_client=self.transport.http_client),
+            )
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
+    def warm_up(self):
+        """Create the client and open connections before the first network stage"""
+        self.client
+        if self.transport is not None:
+            self.transport.prewarm()
+    
+    def print_transport_stats(self):
+        """Report connection pool usage for the run"""
+        if self.transport is not None:
+            self.transport.print_stats()
+    
+    def profile_stage(self, episode, stage):
+        """Profile a pipeline stage when profiling is enabled"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(episode, stage)
+    
+    def write_profile_summary(self):
+        """Write the run's profile summary when profiling is enabled"""
+        if self.profiler is not None:
+            self.profiler.write_summary()
+    
+    def start_live_server(self):
+        """Start the live stream server if a port was configured"""
+        if self.stream_port is not None and self.live_server is None:
+            from stream_server import LiveStreamServer
+            self.live_server = LiveStreamServer(port=self.stream_port).start()
+    
+    def stop_live_server(self):
+        """Stop the live stream server once listeners have drained"""
+        if self.live_server is not None:
+            self.live_server.stop()
+            self.live_server = None
+    
+    def parse_voices(self, spec):
+        """Speaker/voice mapping from "Speaker=Voice,..." pairs.
+
+        Pairs naming the default speakers only change their voices; any other
+        speaker names replace the default cast.
+        """
+        if not spec:
+            return dict(DEFAULT_VOICES)
+        if isinstance(spec, str):
+            spec = spec.split(",")
+        voices = {}
+        for pair in spec:
+            speaker, _, voice_name = pair.partition("=")
+            if not speaker.strip() or not voice_name.strip():
+                raise ValueError(f"Voices must be given as Speaker=Voice, got: {pair}")
+            voices[speaker.strip()] = voice_name.strip()
+        if set(voices) <= set(DEFAULT_VOICES):
+            return {**DEFAULT_VOICES, **voices}
+        return voices
+    
+    def parse_variants(self, voice_specs, languages):
+        """Variants for every voice/language combination except the main episode's.
+
+        A voice spec is either a voice for the host ("Puck") or Speaker=Voice
+        pairs ("Herman=Puck,Corn=Kore"); VARIANT_VOICES separates specs with ";".
+        Slugs name the language and each changed speaker's voice, e.g. en-herman-puck.
+        """
+        if isinstance(voice_specs, str):
+            voice_specs = voice_specs.split(";")
+        if isinstance(languages, str):
+            languages = languages.split(",")
+        voice_sets = [self.variant_voices(spec) for spec in voice_specs or [] if spec.strip()] or [dict(self.voices)]
+        languages = [language.strip().lower() for language in languages or [] if language.strip()] or [SOURCE_LANGUAGE]
+        
+        variants = {}
+        for language in languages:
+            for voices in voice_sets:
+                if language == SOURCE_LANGUAGE and voices == self.voices:
+                    continue
+                changed = [f"{speaker} {name}" for speaker, name in voices.items() if self.voices.get(speaker) != name]
+                slug = self.sanitize_filename(" ".join([language] + changed))
+                if slug in variants and variants[slug]["voices"] != voices:
+                    raise ValueError(f"Variants {variants[slug]['voices']} and {voices} would both be saved as {slug}")
+                variants[slug] = {"slug": slug, "language": language, "voices": voices}
+        return list(variants.values())
+    
+    def variant_voices(self, spec):
+        """Full speaker/voice mapping for a variant voice spec"""
+        if "=" not in spec:
+            return {**self.voices, self.host: spec.strip()}
+        voices = dict(self.voices)
+        for pair in spec.split(","):
+            speaker, _, voice_name = pair.partition("=")
+            if speaker.strip() not in voices or not voice_name.strip():
+                raise ValueError(f"Variant voices must be Speaker=Voice for {', '.join(voices)}, got: {pair}")
+            voices[speaker.strip()] = voice_name.strip()
+        return voices
     
     def sanitize_filename(self, title):
         """Convert episode title to safe filename"""
@@ -49,11 +306,12 @@ class PodcastGenerator:
         sanitized = re.sub(r'[-\s]+', '-', sanitized)
         return sanitized.lower().strip('-')
     
-    def generate_episode_text(self, prompt_content):
+    def generate_episode_text(self, prompt_content, attempt=0):
         """Stage 1: Generate episode text using Gemini 2.5 Flash"""
+        from google.genai import types
         print("🎯 Generating episode text...")
         
-        model = "gemini-2.5-flash"
+        model = self.text_model
         contents = [
             types.Content(
                 role="user",
@@ -68,21 +326,7 @@ class PodcastGenerator:
                 thinking_budget=0,
             ),
             response_mime_type="application/json",
-            response_schema=genai.types.Schema(
-                type=genai.types.Type.OBJECT,
-                required=["episode_title", "episode_description", "episode_transcript"],
-                properties={
-                    "episode_title": genai.types.Schema(
-                        type=genai.types.Type.STRING,
-                    ),
-                    "episode_description": genai.types.Schema(
-                        type=genai.types.Type.STRING,
-                    ),
-                    "episode_transcript": genai.types.Schema(
-                        type=genai.types.Type.STRING,
-                    ),
-                },
-            ),
+            response_schema=self.build_episode_schema(DIALOGUE_FIELDS if self.dialogue else EPISODE_FIELDS),
             system_instruction=[
                 types.Part.from_text(text="""Here's your system prompt with typos corrected and flow slightly smoothed for clarity (no meaning altered):
 
@@ -116,37 +360,328 @@ Your response should be formatted as a JSON object (valid JSON, not stringified)
 
 Would you like me to also tighten this into a **leaner "prompt style" version** (shorter, bullet-pointed, and directly instruction-like), or keep it in this narrative/document format?
 """),
-            ],
+            ] + self.dialogue_instructions(),
         )
         
         # Collect the full response
         response_text = ""
+        usage_metadata = None
         for chunk in self.client.models.generate_content_stream(
             model=model,
             contents=contents,
             config=generate_content_config,
         ):
-            response_text += chunk.text
+            response_text += chunk.text or ""
+            usage_metadata = chunk.usage_metadata or usage_metadata
+        
+        self.usage.record("text", model, usage_metadata)
+
+        episode_data, missing = self.parse_episode_response(response_text)
+
+        if "episode_transcript" in missing:
+            # Nothing worth keeping - a full second attempt is the only option
+            if attempt >= MAX_TEXT_ATTEMPTS - 1:
+                self._raise_unrecoverable(response_text, missing)
+            print("⚠️ Transcript could not be recovered, requesting a fresh generation...")
+            return self.generate_episode_text(prompt_content, attempt=attempt + 1)
+
+        if missing:
+            print(f"⚠️ Recovered transcript, re-asking only for: {', '.join(missing)}")
+            episode_data.update(self.request_missing_fields(episode_data, missing))
+            missing = [field for field in EPISODE_FIELDS if not episode_data.get(field)]
+            if missing:
+                self._raise_unrecoverable(response_text, missing)
+
+        print(f"✅ Generated episode: {episode_data['episode_title']}")
+        return episode_data
+
+    def _raise_unrecoverable(self, response_text, missing):
+        """Report an unusable structured response and abort the episode"""
+        print(f"❌ Failed to recover fields from response: {', '.join(missing)}")
+        print(f"Raw response: {response_text}")
+        raise ValueError(f"Unrecoverable episode response (missing: {', '.join(missing)})")
+
+    def dialogue_instructions(self):
+        """Extra system instruction parts for dialogue mode"""
+        from google.genai import types
+        if not self.dialogue:
+            return []
+        host, cohost = list(self.voices)[:2]
+        return [types.Part.from_text(text=DIALOGUE_INSTRUCTIONS.format(host=host, cohost=cohost))]
+    
+    def build_episode_schema(self, fields):
+        """Build the structured-output schema for the given episode fields"""
+        from google.genai import types
         
+        def field_schema(field):
+            if field != "episode_turns":
+                return types.Schema(
+                    type=types.Type.STRING,
+                )
+            return types.Schema(
+                type=types.Type.ARRAY,
+                items=types.Schema(
+                    type=types.Type.OBJECT,
+                    required=["speaker", "text"],
+                    properties={
+                        "speaker": types.Schema(
+                            type=types.Type.STRING,
+                            enum=list(self.voices),
+                        ),
+                        "text": types.Schema(
+                            type=types.Type.STRING,
+                        ),
+                    },
+                ),
+            )
+        
+        return types.Schema(
+            type=types.Type.OBJECT,
+            required=list(fields),
+            properties={field: field_schema(field) for field in fields},
+        )
+
+    def parse_episode_response(self, response_text):
+        """Parse a structured response, repairing almost-JSON where possible.
+
+        Returns a tuple of (episode_data, missing_fields). Fields that could
+        not be recovered are left out of episode_data and listed in missing_fields.
+        """
+        text = JSON_FENCE_RE.sub("", response_text.strip()).strip()
+
+        # Fast path: valid JSON, possibly stringified more than once
+        decoded = self._loads_lenient(text)
+        for _ in range(2):
+            if not isinstance(decoded, str):
+                break
+            decoded = self._loads_lenient(decoded.strip())
+
+        # Stray text around the object (preambles, trailing characters)
+        if not isinstance(decoded, dict):
+            start, end = text.find("{"), text.rfind("}")
+            if start != -1 and end > start:
+                decoded = self._loads_lenient(text[start:end + 1])
+
+        if isinstance(decoded, dict):
+            episode_data = {
+                field: decoded[field].strip()
+                for field in EPISODE_FIELDS
+                if isinstance(decoded.get(field), str) and decoded[field].strip()
+            }
+            turns = self.clean_turns(decoded.get("episode_turns"))
+        else:
+            # Truncated or otherwise broken JSON: salvage field by field
+            print("🔧 Response is not valid JSON, salvaging fields...")
+            episode_data = self.salvage_episode_fields(text)
+            turns = self.salvage_turns(text)
+        
+        if turns and "episode_transcript" not in episode_data:
+            # Dialogue episodes keep a speaker-tagged transcript alongside the turns
+            episode_data["episode_turns"] = turns
+            episode_data["episode_transcript"] = self.render_dialogue(turns)
+
+        missing = [field for field in EPISODE_FIELDS if field not in episode_data]
+        return episode_data, missing
+
+    def _loads_lenient(self, text):
+        """json.loads that tolerates raw control characters and returns None on failure"""
         try:
-            episode_data = json.loads(response_text)
-            print(f"✅ Generated episode: {episode_data['episode_title']}")
-            return episode_data
-        except json.JSONDecodeError as e:
-            print(f"❌ Failed to parse JSON response: {e}")
-            print(f"Raw response: {response_text}")
-            raise
+            return LENIENT_JSON_DECODER.decode(text)
+        except (json.JSONDecodeError, TypeError):
+            return None
+
+    def salvage_episode_fields(self, text):
+        """Recover episode fields from text that is not valid JSON.
+
+        A field truncated mid-string is cut back to its last complete sentence,
+        as long as that keeps more than half of it. Otherwise (no sentence end
+        in the second half) it is kept as is, ending mid-sentence, with a warning.
+        """
+        episode_data = {}
+        for field in EPISODE_FIELDS:
+            match = re.search(FIELD_KEY_PATTERN.format(field=field.replace("_", r"\\?_")), text)
+            if not match:
+                continue
+
+            raw, terminated = self._scan_json_string(text, match.end())
+            value = self._decode_json_string(raw).strip()
+            if not terminated:
+                # Truncated mid-string: end the text on the last complete sentence
+                ends = [match.end() for match in SENTENCE_END_RE.finditer(value)]
+                if ends and ends[-1] > len(value) // 2:
+                    value = value[:ends[-1]]
+                elif value:
+                    print(f"⚠️ {field} was cut off mid-sentence and is kept as is, check its ending")
+            if value:
+                episode_data[field] = value
+        return episode_data
+
+    def salvage_turns(self, text):
+        """Recover complete dialogue turns from truncated or broken JSON"""
+        turns = []
+        for match in TURN_PATTERN.finditer(text):
+            raw, terminated = self._scan_json_string(text, match.end())
+            if terminated:
+                turns.append({"speaker": match.group(1), "text": self._decode_json_string(raw)})
+        return self.clean_turns(turns)
+    
+    def clean_turns(self, turns):
+        """Validate dialogue turns as (speaker, text) pairs with known speakers"""
+        if not isinstance(turns, list):
+            return []
+        speakers = list(self.voices)
+        cleaned = []
+        for turn in turns:
+            if not isinstance(turn, dict) or not isinstance(turn.get("text"), str) or not turn["text"].strip():
+                continue
+            speaker = str(turn.get("speaker", "")).strip()
+            if speaker not in speakers:
+                # "Herman Poppleberry" -> "Herman"; anyone unknown is read by the host
+                speaker = next((name for name in speakers if speaker.lower().startswith(name.lower())), self.host)
+            cleaned.append((speaker, turn["text"].strip()))
+        return cleaned
+    
+    def render_dialogue(self, turns):
+        """Speaker-tagged transcript, one turn per paragraph"""
+        return "\n\n".join(f"{speaker}: {text}" for speaker, text in turns)
+    
+    def parse_dialogue(self, transcript, speakers):
+        """Turns from a speaker-tagged transcript, or [] if it is not a dialogue"""
+        turns = []
+        pattern = re.compile(rf"^({'|'.join(re.escape(speaker) for speaker in speakers)}):\s*", re.MULTILINE)
+        matches = list(pattern.finditer(transcript))
+        for match, following in zip(matches, matches[1:] + [None]):
+            end = following.start() if following else len(transcript)
+            text = transcript[match.end():end].strip()
+            if text:
+                turns.append((match.group(1), text))
+        return turns
+    
+    def _scan_json_string(self, text, start):
+        """Scan a JSON string body from start, returning (raw_body, terminated)"""
+        i = start
+        while i < len(text):
+            char = text[i]
+            if char == "\\":
+                i += 2
+                continue
+            if char == '"':
+                return text[start:i], True
+            i += 1
+        return text[start:], False
+
+    def _decode_json_string(self, raw):
+        """Decode a JSON string body, dropping broken escapes instead of failing"""
+        if raw.endswith("\\") and (len(raw) - len(raw.rstrip("\\"))) % 2:
+            raw = raw[:-1]
+        raw = INVALID_ESCAPE_RE.sub("", raw)
+        decoded = self._loads_lenient(f'"{raw}"')
+        if decoded is None:
+            # Last resort: a partial unicode escape or similar, keep the text readable
+            decoded = raw.replace("\\n", "\n").replace('\\"', '"').replace("\\\\", "\\")
+        return decoded
+
+    def request_missing_fields(self, episode_data, missing):
+        """Re-ask the text model for only the fields that could not be recovered"""
+        from google.genai import types
+        model = self.text_model
+        known = "\n\n".join(
+            f"{field}:\n{episode_data[field]}" for field in EPISODE_FIELDS if field in episode_data
+        )
+        request = (
+            "The following podcast episode is missing some fields. "
+            f"Return a JSON object containing only: {', '.join(missing)}.\n\n{known}"
+        )
+
+        response = self.client.models.generate_content(
+            model=model,
+            contents=[
+                types.Content(
+                    role="user",
+                    parts=[
+                        types.Part.from_text(text=request),
+                    ],
+                ),
+            ],
+            config=types.GenerateContentConfig(
+                thinking_config=types.ThinkingConfig(
+                    thinking_budget=0,
+                ),
+                response_mime_type="application/json",
+                response_schema=self.build_episode_schema(missing),
+            ),
+        )
+
+        self.usage.record("text-repair", model, response.usage_metadata)
+        recovered, _ = self.parse_episode_response(response.text or "")
+        return {field: recovered[field] for field in missing if field in recovered}
+
+    def generate_audio(self, episode_transcript, episode_folder, turns=None, voices=None, variant=None):
+        """Stage 2: Generate audio using Gemini TTS Flash Preview.
+
+        The normalized script is split into groups of whole segments (or, with
+        speaker-tagged turns in dialogue mode, whole turns with a multi-speaker
+        voice config) that are synthesized concurrently and stitched back
+        together in order. Variants pass their own voices and are tagged in
+        the usage log.
+        """
+        print(f"🎵 Generating audio{f' for variant {variant}' if variant else ''}...")
+        voices = voices or self.voices
+        
+        if turns:
+            speech_config = self.build_speech_config(dialogue=True, voices=voices)
+            groups = ["\n".join(f"{speaker}: {text}" for speaker, text in group) for group in self.group_turns(turns)]
+            print(f"🎙️ Dialogue mode: {len(groups)} turn group(s) with voices {self.voice_summary(voices)}")
+        else:
+            speech_config = self.build_speech_config(dialogue=False, voices=voices)
+            groups = ["\n\n".join(group) for group in self.group_segments(episode_transcript.split("\n\n"))]
+            host = next(iter(voices))
+            print(f"🎙️ {len(groups)} segment group(s) with voice {self.voice_summary({host: voices[host]})}")
+        
+        live_stream = self.live_server.open_stream(self.stream_slug(episode_folder)) if self.live_server else None
+        writer = None
+        if live_stream is not None:
+            from stream_server import OrderedStreamWriter
+            writer = OrderedStreamWriter(lambda inline_data: self.forward_to_live_stream(live_stream, inline_data), len(groups))
+        
+        try:
+            if len(groups) == 1:
+                results = [self.synthesize(groups[0], speech_config, writer, 0, variant)]
+            else:
+                with ThreadPoolExecutor(max_workers=min(MAX_TTS_WORKERS, len(groups))) as executor:
+                    futures = [
+                        executor.submit(self.synthesize, text, speech_config, writer, index, variant)
+                        for index, text in enumerate(groups)
+                    ]
+                    results = [future.result() for future in futures]
+        finally:
+            if live_stream is not None:
+                live_stream.close()
+        
+        audio_chunks = [data for group_chunks in results for data in group_chunks]
+        if audio_chunks and all(results):
+            # Combine all audio chunks
+            combined_audio = b''.join(audio_chunks)
+            
+            with self.store.batch(episode_folder) as batch:
+                batch.add("episode.mp3", combined_audio)
+            
+            print(f"✅ Audio saved to: {episode_folder / 'episode.mp3'}")
+            return True
+        else:
+            print("❌ No audio data received")
+            return False
     
-    def generate_audio(self, episode_transcript, episode_folder):
-        """Stage 2: Generate audio using Gemini TTS Flash Preview"""
-        print("🎵 Generating audio...")
+    def synthesize(self, text, speech_config, writer=None, index=0, variant=None):
+        """Stream one TTS request and return its audio chunks"""
+        from google.genai import types
         
-        model = "gemini-2.5-pro-preview-tts"
+        model = self.tts_model
         contents = [
             types.Content(
                 role="user",
                 parts=[
-                    types.Part.from_text(text=episode_transcript),
+                    types.Part.from_text(text=text),
                 ],
             ),
         ]
@@ -156,55 +691,129 @@ Would you like me to also tighten this into a **leaner "prompt style" version**
             response_modalities=[
                 "audio",
             ],
-            speech_config=types.SpeechConfig(
-                voice_config=types.VoiceConfig(
-                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                        voice_name="Sadaltager"
-                    )
-                )
-            ),
+            speech_config=speech_config,
         )
         
         audio_chunks = []
-        for chunk in self.client.models.generate_content_stream(
-            model=model,
-            contents=contents,
-            config=generate_content_config,
-        ):
-            if (
-                chunk.candidates is None
-                or chunk.candidates[0].content is None
-                or chunk.candidates[0].content.parts is None
+        audio_seconds = 0.0
+        usage_metadata = None
+        try:
+            for chunk in self.client.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=generate_content_config,
             ):
-                continue
-            
-            if chunk.candidates[0].content.parts[0].inline_data and chunk.candidates[0].content.parts[0].inline_data.data:
-                inline_data = chunk.candidates[0].content.parts[0].inline_data
-                data_buffer = inline_data.data
-                file_extension = mimetypes.guess_extension(inline_data.mime_type)
-                
-                if file_extension is None:
-                    file_extension = ".wav"
-                    data_buffer = self.convert_to_wav(inline_data.data, inline_data.mime_type)
+                # The final chunk carries the complete usage but usually no content
+                usage_metadata = chunk.usage_metadata or usage_metadata
+                if (
+                    chunk.candidates is None
+                    or chunk.candidates[0].content is None
+                    or chunk.candidates[0].content.parts is None
+                ):
+                    continue
                 
-                audio_chunks.append(data_buffer)
-            else:
-                if chunk.text:
-                    print(chunk.text)
+                if chunk.candidates[0].content.parts[0].inline_data and chunk.candidates[0].content.parts[0].inline_data.data:
+                    inline_data = chunk.candidates[0].content.parts[0].inline_data
+                    if writer is not None:
+                        writer.write(index, inline_data)
+                    data_buffer = inline_data.data
+                    file_extension = mimetypes.guess_extension(inline_data.mime_type)
+                    
+                    if file_extension is None:
+                        file_extension = ".wav"
+                        data_buffer = self.convert_to_wav(inline_data.data, inline_data.mime_type)
+                        audio_seconds += self.pcm_duration(inline_data.data, inline_data.mime_type)
+                    
+                    audio_chunks.append(data_buffer)
+                else:
+                    if chunk.text:
+                        print(chunk.text)
+        finally:
+            if writer is not None:
+                writer.finish(index)
         
-        if audio_chunks:
-            # Combine all audio chunks
-            combined_audio = b''.join(audio_chunks)
-            audio_file = episode_folder / "episode.mp3"
-            
-            with open(audio_file, "wb") as f:
-                f.write(combined_audio)
-            
-            print(f"✅ Audio saved to: {audio_file}")
-            return True
-        else:
-            print("❌ No audio data received")
-            return False
+        self.usage.record("audio", model, usage_metadata, audio_seconds=audio_seconds or None, variant=variant)
+        return audio_chunks
+    
+    def build_speech_config(self, dialogue, voices=None):
+        """Single-voice config for monologues, multi-speaker config for dialogues"""
+        from google.genai import types
+        voices = voices or self.voices
+        
+        def voice(name):
+            return types.VoiceConfig(
+                prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                    voice_name=name
+                )
+            )
+        
+        if not dialogue:
+            return types.SpeechConfig(voice_config=voice(next(iter(voices.values()))))
+        if len(voices) != 2:
+            raise ValueError(f"Dialogue mode needs exactly two speaker voices, got: {self.voice_summary(voices)}")
+        return types.SpeechConfig(
+            multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
+                speaker_voice_configs=[
+                    types.SpeakerVoiceConfig(speaker=speaker, voice_config=voice(name))
+                    for speaker, name in voices.items()
+                ]
+            )
+        )
+    
+    def voice_summary(self, voices=None):
+        """Speaker/voice pairs for logs and metadata"""
+        return ", ".join(f"{speaker}={name}" for speaker, name in (voices or self.voices).items())
+    
+    def group_turns(self, turns):
+        """Pack consecutive turns into groups of at most TTS_GROUP_CHARS"""
+        return self.pack_groups(turns, lambda turn: len(turn[0]) + len(turn[1]) + 3)
+    
+    def group_segments(self, segments):
+        """Pack consecutive normalized segments into groups of at most TTS_GROUP_CHARS"""
+        return self.pack_groups([segment for segment in segments if segment.strip()], lambda segment: len(segment) + 2)
+    
+    def pack_groups(self, items, size_of):
+        """Greedily pack items into groups whose total size stays within TTS_GROUP_CHARS"""
+        groups = []
+        current = []
+        size = 0
+        for item in items:
+            item_size = size_of(item)
+            if current and size + item_size > TTS_GROUP_CHARS:
+                groups.append(current)
+                current, size = [], 0
+            current.append(item)
+            size += item_size
+        if current:
+            groups.append(current)
+        return groups
+    
+    def stream_slug(self, episode_folder):
+        """Live stream name: the episode folder relative to the output directory"""
+        try:
+            return episode_folder.relative_to(self.output_dir).as_posix()
+        except ValueError:
+            return episode_folder.name
+    
+    def forward_to_live_stream(self, live_stream, inline_data):
+        """Forward a TTS chunk to live listeners, sending the stream header first"""
+        from stream_server import streaming_wav_header
+        if live_stream.content_type is None:
+            if mimetypes.guess_extension(inline_data.mime_type) is None:
+                # Raw PCM: one streaming WAV header, then bare samples
+                parameters = self.parse_audio_mime_type(inline_data.mime_type)
+                live_stream.start(
+                    "audio/wav",
+                    streaming_wav_header(parameters["rate"], parameters["bits_per_sample"]),
+                )
+            else:
+                live_stream.start(inline_data.mime_type)
+        live_stream.write(inline_data.data)
+    
+    def pcm_duration(self, audio_data, mime_type):
+        """Duration in seconds of raw mono PCM audio"""
+        parameters = self.parse_audio_mime_type(mime_type)
+        return len(audio_data) / (parameters["rate"] * (parameters["bits_per_sample"] // 8))
     
     def convert_to_wav(self, audio_data: bytes, mime_type: str) -> bytes:
         """Convert audio data to WAV format"""
@@ -258,41 +867,386 @@ Would you like me to also tighten this into a **leaner "prompt style" version**
         
         return {"bits_per_sample": bits_per_sample, "rate": rate}
     
-    def save_episode_files(self, episode_data, episode_folder):
+    def prepare_tts_script(self, episode_transcript, turns=None):
+        """Stage 1.5: Normalize the transcript into speakable text for TTS"""
+        print("🧹 Normalizing transcript for TTS...")
+        tts_script = self.build_tts_script(episode_transcript, turns)
+        print(
+            f"✅ TTS script ready: {len(tts_script['segments'])} segments, "
+            f"{tts_script['characters_saved']} characters saved"
+        )
+        return tts_script
+
+    def build_tts_script(self, episode_transcript, turns=None, language=SOURCE_LANGUAGE):
+        """Normalized TTS script for a monologue transcript or dialogue turns"""
+        if turns:
+            return self.normalize_dialogue(episode_transcript, turns, language)
+        return normalize_for_tts(episode_transcript, language=language)
+    
+    def normalize_dialogue(self, episode_transcript, turns, language=SOURCE_LANGUAGE):
+        """Normalize each turn separately so every segment keeps its speaker"""
+        tts_turns = [
+            (speaker, segment)
+            for speaker, text in turns
+            for segment in normalize_for_tts(text, language=language)["segments"]
+        ]
+        tts_text = self.render_dialogue(tts_turns)
+        return {
+            "text": tts_text,
+            "segments": [segment for _, segment in tts_turns],
+            "turns": tts_turns,
+            "source_sha256": content_hash(episode_transcript),
+            "normalizer_version": NORMALIZER_VERSION,
+            "characters_saved": len(episode_transcript) - len(tts_text),
+        }
+    
+    def calibrate_durations(self):
+        """Fit the duration predictor to every past episode with audio"""
+        samples = []
+        for episode in self.list_episodes():
+            duration = episode.get("duration") or {}
+            actual = duration.get("actual_seconds") or (episode.get("usage") or {}).get("audio_seconds")
+            if not episode["has_audio"] or not actual:
+                continue
+            words = duration.get("words")
+            if words is None:
+                # Episodes from before duration tracking: count their TTS script
+                tts_text = self.store.read_artifact(episode["folder"], "tts_script.txt")
+                if tts_text is None:
+                    continue
+                words = len(tts_text.decode("utf-8").split())
+            samples.append((words, actual))
+        self.durations.calibrate(samples)
+        print(f"⏱️ Duration model: {self.durations.describe()}")
+    
+    def generate_episode_script(self, episode, prompt_content):
+        """Stages 1 and 1.5 with length enforcement.
+        
+        Returns (episode_data, tts_script, verdict). When no draft fits the
+        target duration, the closest one is returned with its verdict.
+        """
+        request = prompt_content
+        closest = None
+        for attempt in range(MAX_LENGTH_ATTEMPTS):
+            suffix = f"-retry{attempt}" if attempt else ""
+            with self.profile_stage(episode, "text" + suffix):
+                episode_data = self.generate_episode_text(request)
+            
+            with self.profile_stage(episode, "normalize" + suffix):
+                tts_script = self.prepare_tts_script(episode_data["episode_transcript"], episode_data.get("episode_turns"))
+                episode_data, tts_script, verdict = self.fit_to_duration(episode_data, tts_script)
+            
+            if verdict == DurationPredictor.OK:
+                return episode_data, tts_script, verdict
+            
+            words = count_words(tts_script)
+            if closest is None or self.durations.miss(words) < self.durations.miss(count_words(closest[1])):
+                closest = (episode_data, tts_script, verdict)
+            request = prompt_content + LENGTH_NOTE.format(
+                predicted=format_duration(self.durations.predict(words)),
+                words=words,
+                target=f"{format_duration(self.durations.min_seconds)} to {format_duration(self.durations.max_seconds)}",
+                target_words=int((self.durations.min_seconds + self.durations.max_seconds) / 2 * self.durations.words_per_second),
+            )
+            if attempt < MAX_LENGTH_ATTEMPTS - 1:
+                print("🔁 Regenerating the script with a length correction...")
+        return closest
+    
+    def fit_to_duration(self, episode_data, tts_script):
+        """Check a script's predicted duration, trimming scripts that run slightly long.
+        
+        Returns (episode_data, tts_script, verdict).
+        """
+        words = count_words(tts_script)
+        verdict = self.durations.check(words)
+        predicted = format_duration(self.durations.predict(words))
+        if verdict == DurationPredictor.OK:
+            print(f"⏱️ Predicted duration: {predicted} ({words} words)")
+            return episode_data, tts_script, verdict
+        
+        if verdict == DurationPredictor.TOO_LONG and self.durations.trimmable(words):
+            trimmed = self.trim_episode(episode_data)
+            if trimmed is not None:
+                trimmed_data, trimmed_script, dropped = trimmed
+                trimmed_words = count_words(trimmed_script)
+                print(
+                    f"✂️ Predicted {predicted} is too long, trimmed {dropped} paragraph(s): "
+                    f"{format_duration(self.durations.predict(trimmed_words))} ({trimmed_words} words)"
+                )
+                return trimmed_data, trimmed_script, DurationPredictor.OK
+        
+        min_seconds, max_seconds = self.durations.bounds()
+        print(
+            f"⚠️ Predicted duration {predicted} ({words} words) is outside the target "
+            f"{format_duration(min_seconds)}-{format_duration(max_seconds)}"
+        )
+        return episode_data, tts_script, verdict
+    
+    def trim_episode(self, episode_data):
+        """Drop paragraphs (or turns) before the closing one until the script fits.
+        
+        The opening and closing paragraphs are always kept. Returns
+        (episode_data, tts_script, dropped), or None if no trim fits the window.
+        """
+        turns = episode_data.get("episode_turns")
+        units = list(turns) if turns else [p for p in episode_data["episode_transcript"].split("\n\n") if p.strip()]
+        dropped = 0
+        while len(units) > 2:
+            del units[-2]
+            dropped += 1
+            trimmed = dict(episode_data)
+            if turns:
+                trimmed["episode_turns"] = list(units)
+                trimmed["episode_transcript"] = self.render_dialogue(units)
+            else:
+                trimmed["episode_transcript"] = "\n\n".join(units)
+            tts_script = self.build_tts_script(trimmed["episode_transcript"], trimmed.get("episode_turns"))
+            verdict = self.durations.check(count_words(tts_script))
+            if verdict == DurationPredictor.OK:
+                return trimmed, tts_script, dropped
+            if verdict == DurationPredictor.TOO_SHORT:
+                return None
+        return None
+    
+    def record_duration(self, duration, audio_success):
+        """Fill in an episode's actual duration and feed it back into the predictor"""
+        actual = self.usage.episode_summary()["audio_seconds"] if audio_success else None
+        duration = dict(duration, actual_seconds=round(actual, 1) if actual else None)
+        if actual:
+            print(f"⏱️ Actual duration: {format_duration(actual)} (predicted {format_duration(duration['predicted_seconds'])})")
+            self.durations.add_sample(duration["words"], actual)
+        return duration
+    
+    def save_episode_files(self, episode_data, episode_folder, tts_script, source_prompt=None, duration=None):
         """Save all episode files in the specified structure"""
         print("💾 Saving episode files...")
         
-        # Create episode folder
-        episode_folder.mkdir(parents=True, exist_ok=True)
-        
-        # Save script.txt (just the transcript)
-        script_file = episode_folder / "script.txt"
-        with open(script_file, "w", encoding="utf-8") as f:
-            f.write(episode_data["episode_transcript"])
-        
-        # Save showtext.txt (title and description with line separation)
-        showtext_file = episode_folder / "showtext.txt"
-        with open(showtext_file, "w", encoding="utf-8") as f:
-            f.write(f"{episode_data['episode_title']}\n{episode_data['episode_description']}")
-        
-        # Save metadata.json (all text elements)
-        metadata = {
-            "episode_title": episode_data["episode_title"],
-            "episode_description": episode_data["episode_description"],
-            "episode_transcript": episode_data["episode_transcript"],
-            "generated_at": datetime.now().isoformat(),
-            "generator_version": "1.0",
-            "models_used": {
-                "text_generation": "gemini-2.5-flash",
-                "audio_generation": "gemini-2.5-pro-preview-tts"
-            }
+        with self.store.batch(episode_folder, fresh=True) as batch:
+            # script.txt (just the transcript) and tts_script.txt (as sent to TTS)
+            batch.add("script.txt", episode_data["episode_transcript"])
+            batch.add("tts_script.txt", tts_script["text"])
+            
+            # metadata.json references the artifacts instead of repeating them;
+            # showtext.txt is derived from the title and description
+            batch.update_metadata({
+                "episode_title": episode_data["episode_title"],
+                "episode_description": episode_data["episode_description"],
+                "generated_at": datetime.now().isoformat(),
+                "generator_version": "1.0",
+                "source_prompt": source_prompt,
+                "mode": "dialogue" if tts_script.get("turns") else "monologue",
+                "voices": self.voices if tts_script.get("turns") else {self.host: self.voices[self.host]},
+                "tts_script": self.tts_script_metadata(tts_script),
+                "duration": duration,
+                "models_used": {
+                    "text_generation": self.text_model,
+                    "audio_generation": self.tts_model
+                }
+            })
+        
+        print(f"✅ Episode files saved in: {episode_folder}")
+    
+    def tts_script_metadata(self, tts_script):
+        """Summary of a normalized TTS script for metadata.json"""
+        return {
+            "source_sha256": tts_script["source_sha256"],
+            "normalizer_version": tts_script["normalizer_version"],
+            "segments": len(tts_script["segments"]),
+            "characters_saved": tts_script["characters_saved"],
         }
+    
+    def render_episode_audio(self, episode_folder, episode_data, tts_script):
+        """Stage 2 for an episode, with its variants rendered concurrently; returns the episode's audio success"""
+        if not self.variants:
+            return self.generate_audio(tts_script["text"], episode_folder, turns=tts_script.get("turns"))
         
-        metadata_file = episode_folder / "metadata.json"
-        with open(metadata_file, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            main_audio = executor.submit(self.generate_audio, tts_script["text"], episode_folder, turns=tts_script.get("turns"))
+            results = self.render_variants(episode_folder, episode_data)
+            audio_success = main_audio.result()
+        # Written after the main audio so the two never update metadata.json at once
+        self.record_variants(episode_folder, results)
+        return audio_success
+    
+    def render_variants(self, episode_folder, episode_data):
+        """Translate once per language, then render every variant concurrently"""
+        print(f"🔀 Rendering {len(self.variants)} variant(s): {', '.join(variant['slug'] for variant in self.variants)}")
+        source_sha256 = content_hash(episode_data["episode_transcript"])
+        languages = sorted({variant["language"] for variant in self.variants})
         
-        print(f"✅ Episode files saved in: {episode_folder}")
+        # Separate pools: variants wait on translations, so they must not compete for workers
+        with ThreadPoolExecutor(max_workers=min(MAX_VARIANT_WORKERS, len(languages))) as translators:
+            translations = {
+                language: translators.submit(self.translated_episode, episode_folder, episode_data, language)
+                for language in languages
+            }
+            with ThreadPoolExecutor(max_workers=min(MAX_VARIANT_WORKERS, len(self.variants))) as renderers:
+                futures = {
+                    variant["slug"]: renderers.submit(
+                        self.render_variant, episode_folder, variant, translations[variant["language"]], source_sha256
+                    )
+                    for variant in self.variants
+                }
+                return {slug: future.result() for slug, future in futures.items()}
+    
+    def translated_episode(self, episode_folder, episode_data, language):
+        """The episode in a language: the original, a stored translation of the same transcript, or a new one"""
+        if language == SOURCE_LANGUAGE:
+            return episode_data
+        
+        source_sha256 = content_hash(episode_data["episode_transcript"])
+        for metadata_file in sorted((episode_folder / VARIANTS_DIR_NAME).glob("*/metadata.json")):
+            metadata = self.store.load_metadata(metadata_file.parent)
+            if metadata.get("translation") != {"language": language, "source_sha256": source_sha256}:
+                continue
+            script = self.store.read_artifact(metadata_file.parent, "script.txt")
+            if script is None:
+                continue
+            print(f"♻️ Reusing the {language} translation from variant {metadata_file.parent.name}")
+            translated = {
+                "episode_title": metadata.get("episode_title", episode_data["episode_title"]),
+                "episode_description": metadata.get("episode_description", episode_data["episode_description"]),
+                "episode_transcript": script.decode("utf-8"),
+            }
+            if episode_data.get("episode_turns"):
+                speakers = list(dict.fromkeys(speaker for speaker, _ in episode_data["episode_turns"]))
+                translated["episode_turns"] = self.parse_dialogue(translated["episode_transcript"], speakers)
+            return translated
+        
+        return self.translate_episode(episode_data, language)
+    
+    def translate_episode(self, episode_data, language):
+        """Translate an episode's title, description and transcript (or turns) with the text model"""
+        from google.genai import types
+        language_name = LANGUAGE_NAMES.get(language, language)
+        print(f"🌐 Translating into {language_name}...")
+        
+        model = self.text_model
+        turns = episode_data.get("episode_turns")
+        fields = DIALOGUE_FIELDS if turns else EPISODE_FIELDS
+        source = {field: episode_data[field] for field in fields if field != "episode_turns"}
+        if turns:
+            source["episode_turns"] = [{"speaker": speaker, "text": text} for speaker, text in turns]
+        
+        response = self.client.models.generate_content(
+            model=model,
+            contents=[
+                types.Content(
+                    role="user",
+                    parts=[
+                        types.Part.from_text(text=json.dumps(source, ensure_ascii=False, indent=2)),
+                    ],
+                ),
+            ],
+            config=types.GenerateContentConfig(
+                thinking_config=types.ThinkingConfig(
+                    thinking_budget=0,
+                ),
+                response_mime_type="application/json",
+                response_schema=self.build_episode_schema(fields),
+                system_instruction=[
+                    types.Part.from_text(text=TRANSLATION_INSTRUCTIONS.format(language=language_name)),
+                ],
+            ),
+        )
+        
+        self.usage.record("translation", model, response.usage_metadata, variant=language)
+        translated, missing = self.parse_episode_response(response.text or "")
+        if missing:
+            raise ValueError(f"Translation into {language_name} is missing: {', '.join(missing)}")
+        return translated
+    
+    def render_variant(self, episode_folder, variant, translation, source_sha256):
+        """Save and synthesize one variant under the episode's variants/ folder"""
+        variant_folder = episode_folder / VARIANTS_DIR_NAME / variant["slug"]
+        summary = {
+            "language": variant["language"],
+            "voices": variant["voices"],
+            "path": f"{VARIANTS_DIR_NAME}/{variant['slug']}",
+            "has_audio": False,
+        }
+        try:
+            episode_data = translation.result()
+            tts_script = self.build_tts_script(
+                episode_data["episode_transcript"], episode_data.get("episode_turns"), variant["language"]
+            )
+            turns = tts_script.get("turns")
+            host = next(iter(variant["voices"]))
+            summary["voices"] = variant["voices"] if turns else {host: variant["voices"][host]}
+            
+            with self.store.batch(variant_folder, fresh=True) as batch:
+                batch.add("script.txt", episode_data["episode_transcript"])
+                batch.add("tts_script.txt", tts_script["text"])
+                batch.update_metadata({
+                    "episode_title": episode_data["episode_title"],
+                    "episode_description": episode_data["episode_description"],
+                    "generated_at": datetime.now().isoformat(),
+                    "variant": variant["slug"],
+                    "language": variant["language"],
+                    "translation": (
+                        {"language": variant["language"], "source_sha256": source_sha256}
+                        if variant["language"] != SOURCE_LANGUAGE else None
+                    ),
+                    "mode": "dialogue" if turns else "monologue",
+                    "voices": summary["voices"],
+                    "tts_script": self.tts_script_metadata(tts_script),
+                    "models_used": {
+                        "text_generation": self.text_model,
+                        "audio_generation": self.tts_model
+                    }
+                })
+            
+            summary["has_audio"] = self.generate_audio(
+                tts_script["text"], variant_folder, turns=turns, voices=variant["voices"], variant=variant["slug"]
+            )
+            # Translations are shared by every variant of a language (see record_variants)
+            self.store.update_metadata(variant_folder, {"usage": self.usage.episode_summary(variant=variant["slug"], stage="audio")})
+        except Exception as e:
+            print(f"❌ Variant {variant['slug']} failed: {e}")
+        return summary
+    
+    def record_variants(self, episode_folder, results):
+        """List rendered variants, and the usage of the translations they share, in the episode's metadata.json"""
+        metadata = self.store.load_metadata(episode_folder)
+        variants = metadata.get("variants") or {}
+        variants.update(results)
+        translations = metadata.get("translations") or {}
+        for language in sorted({result["language"] for result in results.values()} - {SOURCE_LANGUAGE}):
+            usage = self.usage.episode_summary(variant=language, stage="translation")
+            if usage["calls"]:
+                # Reused translations made no calls and keep their earlier usage
+                translations[language] = {"usage": usage}
+        self.store.update_metadata(episode_folder, {"variants": variants, "translations": translations})
+        rendered = sum(1 for result in results.values() if result["has_audio"])
+        print(f"🔀 Variants with audio: {rendered}/{len(results)}")
+    
+    def variant_translations(self):
+        """Number of languages the configured variants are translated into"""
+        return len({variant["language"] for variant in self.variants} - {SOURCE_LANGUAGE})
+    
+    def budget_allows(self, episode_name, renderings=1, translations=0):
+        """Budget check for commands that reuse a saved script (rerender, variants).
+        
+        May switch to cheaper models; returns False when the work does not fit.
+        """
+        decision, text_model, tts_model = self.scheduler.decide(
+            "normal", self.text_model, self.tts_model,
+            renderings=renderings, translations=translations, text=False,
+        )
+        if decision == BudgetScheduler.STOP:
+            print(f"🛑 Budget nearly exhausted (${self.scheduler.remaining():.4f} left), skipping {episode_name}")
+            return False
+        if decision == BudgetScheduler.DOWNGRADE:
+            print(f"⬇️ Budget is tight, switching to {text_model} + {tts_model}")
+            self.text_model, self.tts_model = text_model, tts_model
+        return True
+    
+    def prompt_priority(self, prompt_file):
+        """Priority encoded in the prompt file name (topic.low.txt), default normal"""
+        suffixes = prompt_file.suffixes
+        if len(suffixes) >= 2 and suffixes[-2][1:] in PROMPT_PRIORITIES:
+            return suffixes[-2][1:]
+        return "normal"
     
     def process_prompt_file(self, prompt_file):
         """Process a single prompt file through the complete workflow"""
@@ -306,19 +1260,37 @@ Would you like me to also tighten this into a **leaner "prompt style" version**
             print(f"⚠️ Skipping empty prompt file: {prompt_file.name}")
             return False
         
+        self.usage.start_episode()
+        episode = prompt_file.name.removesuffix(".txt")
         try:
-            # Stage 1: Generate episode text
-            episode_data = self.generate_episode_text(prompt_content)
+            # Stage 1: Generate episode text, normalized for speech and checked for length
+            episode_data, tts_script, verdict = self.generate_episode_script(episode, prompt_content)
             
             # Create episode folder
             episode_title_safe = self.sanitize_filename(episode_data["episode_title"])
             episode_folder = self.output_dir / episode_title_safe
+            duration = self.durations.summary(count_words(tts_script))
             
             # Save text files
-            self.save_episode_files(episode_data, episode_folder)
+            with self.profile_stage(episode, "save"):
+                self.save_episode_files(episode_data, episode_folder, tts_script, source_prompt=prompt_file.name, duration=duration)
+            
+            if verdict != DurationPredictor.OK:
+                # Keep the closest draft (its text is paid for) but do not spend TTS on it
+                self.store.update_metadata(episode_folder, {"usage": self.usage.episode_summary()})
+                print(
+                    f"❌ No script within the target duration after {MAX_LENGTH_ATTEMPTS} attempts; "
+                    f"saved the closest draft without audio (edit it and run: rerender {episode_folder.name})"
+                )
+                return False
             
             # Stage 2: Generate audio
-            audio_success = self.generate_audio(episode_data["episode_transcript"], episode_folder)
+            with self.profile_stage(episode, "audio"):
+                audio_success = self.render_episode_audio(episode_folder, episode_data, tts_script)
+                self.store.update_metadata(episode_folder, {
+                    "usage": self.usage.episode_summary(),
+                    "duration": self.record_duration(duration, audio_success),
+                })
             
             if audio_success:
                 print(f"🎉 Successfully generated episode: {episode_data['episode_title']}")
@@ -337,17 +1309,40 @@ Would you like me to also tighten this into a **leaner "prompt style" version**
             print(f"❌ Prompts directory not found: {self.prompts_dir}")
             return
         
-        prompt_files = list(self.prompts_dir.glob("*.txt"))
+        prompt_files = sorted(
+            self.prompts_dir.glob("*.txt"),
+            key=lambda path: (PROMPT_PRIORITIES[self.prompt_priority(path)], path.name),
+        )
         if not prompt_files:
             print(f"⚠️ No .txt files found in {self.prompts_dir}")
             return
         
         print(f"📁 Found {len(prompt_files)} prompt files")
+        self.calibrate_durations()
+        self.start_live_server()
+        self.warm_up()
         
         successful = 0
         failed = 0
+        deferred = 0
         
-        for prompt_file in prompt_files:
+        for index, prompt_file in enumerate(prompt_files):
+            decision, text_model, tts_model = self.scheduler.decide(
+                self.prompt_priority(prompt_file), self.text_model, self.tts_model,
+                renderings=1 + len(self.variants), translations=self.variant_translations(),
+            )
+            if decision == BudgetScheduler.DEFER:
+                print(f"⏸️ Deferring low-priority prompt to stay within budget: {prompt_file.name}")
+                deferred += 1
+                continue
+            if decision == BudgetScheduler.STOP:
+                print(f"🛑 Budget nearly exhausted (${self.scheduler.remaining():.4f} left), stopping before {prompt_file.name}")
+                deferred += len(prompt_files) - index
+                break
+            if decision == BudgetScheduler.DOWNGRADE:
+                print(f"⬇️ Budget is tight, switching to {text_model} + {tts_model}")
+                self.text_model, self.tts_model = text_model, tts_model
+            
             if self.process_prompt_file(prompt_file):
                 successful += 1
             else:
@@ -356,14 +1351,363 @@ Would you like me to also tighten this into a **leaner "prompt style" version**
         print(f"\n📊 Processing complete:")
         print(f"✅ Successful: {successful}")
         print(f"❌ Failed: {failed}")
+        if deferred:
+            print(f"⏸️ Deferred: {deferred}")
+        print(f"💰 Run cost: ${self.usage.run_cost():.4f}")
+        self.print_transport_stats()
         print(f"📁 Episodes saved in: {self.output_dir.absolute()}")
+        self.write_profile_summary()
+        
+        self.stop_live_server()
+    
+    def list_episodes(self):
+        """Metadata of every generated episode, newest first"""
+        episodes = []
+        for metadata_file in self.output_dir.glob("*/metadata.json"):
+            try:
+                with open(metadata_file, "r", encoding="utf-8") as f:
+                    metadata = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            metadata["folder"] = metadata_file.parent
+            metadata["has_audio"] = self.store.has_artifact(metadata_file.parent, "episode.mp3", metadata)
+            episodes.append(metadata)
+        episodes.sort(key=lambda metadata: metadata.get("generated_at", ""), reverse=True)
+        return episodes
+    
+    def print_status(self):
+        """Summarize prompts, episodes and spend without touching the network"""
+        prompt_files = list(self.prompts_dir.glob("*.txt")) if self.prompts_dir.exists() else []
+        episodes = self.list_episodes()
+        covered = {episode.get("source_prompt") for episode in episodes}
+        without_episode = [path for path in prompt_files if path.name not in covered]
+        without_audio = [episode for episode in episodes if not episode["has_audio"]]
+        
+        print(f"📁 Prompts: {len(prompt_files)} ({len(without_episode)} without an episode yet)")
+        print(f"🎙️ Episodes: {len(episodes)} ({len(without_audio)} missing audio)")
+        print(f"💰 Spent today: ${self.usage.daily_cost():.4f}")
+        remaining = self.scheduler.remaining()
+        if remaining is not None:
+            print(f"💰 Budget remaining: ${remaining:.4f}")
+        for episode in without_audio:
+            print(f"  ⚠️ No audio: {episode['folder'].name} (try: rerender {episode['folder'].name})")
+    
+    def print_episode_list(self):
+        """Print one line per generated episode"""
+        episodes = self.list_episodes()
+        if not episodes:
+            print(f"⚠️ No episodes found in {self.output_dir}")
+            return
+        for episode in episodes:
+            audio_seconds = episode.get("usage", {}).get("audio_seconds")
+            duration = f"{int(audio_seconds // 60)}m {int(audio_seconds % 60):02d}s" if audio_seconds else "--"
+            audio = "🎵" if episode["has_audio"] else "  "
+            variants = f"  (+{len(episode['variants'])} variants)" if episode.get("variants") else ""
+            print(f"{audio} {episode.get('generated_at', '')[:16]:16}  {duration:>7}  {episode['folder'].name}{variants}")
+    
+    def resolve_episode_folder(self, episode_name):
+        """Episode folder from a path or a folder name under the output directory"""
+        episode_folder = Path(episode_name)
+        if not (episode_folder / "metadata.json").exists():
+            episode_folder = self.output_dir / episode_name
+        return episode_folder
+    
+    def read_script(self, episode_folder, episode_name):
+        """An episode's saved transcript, or None (with the reason printed)"""
+        try:
+            script = self.store.read_artifact(episode_folder, "script.txt")
+        except ValueError as e:
+            print(f"❌ Cannot use the script of {episode_name}: {e}")
+            return None
+        if script is None:
+            print(f"❌ No script found for episode: {episode_name}")
+            return None
+        return script.decode("utf-8")
+    
+    def load_tts_script(self, episode_folder, episode_transcript, metadata, speakers=None):
+        """The saved tts_script.txt, if it was normalized from this transcript by the current rules.
+        
+        Hand edits to tts_script.txt (e.g. pronunciation fixes) are kept this way.
+        """
+        stored = metadata.get("tts_script") or {}
+        source_sha256 = content_hash(episode_transcript)
+        if stored.get("source_sha256") != source_sha256 or stored.get("normalizer_version") != NORMALIZER_VERSION:
+            return None
+        data = self.store.read_artifact(episode_folder, "tts_script.txt")
+        if data is None:
+            return None
+        text = data.decode("utf-8")
+        tts_script = {
+            "text": text,
+            "source_sha256": source_sha256,
+            "normalizer_version": NORMALIZER_VERSION,
+            "characters_saved": len(episode_transcript) - len(text),
+        }
+        if speakers:
+            tts_script["turns"] = self.parse_dialogue(text, speakers)
+            if not tts_script["turns"]:
+                return None
+            tts_script["segments"] = [segment for _, segment in tts_script["turns"]]
+        else:
+            tts_script["segments"] = [segment for segment in text.split("\n\n") if segment.strip()]
+        print(f"♻️ Reusing the saved TTS script ({len(tts_script['segments'])} segments)")
+        return tts_script
+    
+    def rerender_episode(self, episode_name):
+        """Redo stage 2 for an existing episode from its saved script"""
+        episode_folder = self.resolve_episode_folder(episode_name)
+        script = self.read_script(episode_folder, episode_name)
+        if script is None or not self.budget_allows(episode_folder.name):
+            return False
+        
+        print(f"\n🔁 Re-rendering: {episode_folder.name}")
+        episode_transcript = script
+        metadata = self.store.load_metadata(episode_folder)
+        
+        turns = None
+        voices = self.voices
+        if metadata.get("mode") == "dialogue":
+            # Keep the episode's cast unless the configured voices name the same speakers
+            if not set(metadata.get("voices", {})) <= set(self.voices):
+                voices = metadata["voices"]
+            turns = self.parse_dialogue(episode_transcript, list(voices))
+        
+        self.usage.start_episode()
+        previous_voices, self.voices = self.voices, voices
+        try:
+            with self.profile_stage(episode_folder.name, "normalize"):
+                tts_script = self.load_tts_script(episode_folder, episode_transcript, metadata, list(voices) if turns else None)
+                if tts_script is None:
+                    tts_script = self.prepare_tts_script(episode_transcript, turns)
+                    with self.store.batch(episode_folder) as batch:
+                        batch.add("tts_script.txt", tts_script["text"])
+            
+            # The script is kept as is, but the prediction is still recorded for calibration
+            duration = self.durations.summary(count_words(tts_script))
+            print(f"⏱️ Predicted duration: {format_duration(duration['predicted_seconds'])} ({duration['words']} words)")
+            
+            with self.profile_stage(episode_folder.name, "audio"):
+                audio_success = self.generate_audio(tts_script["text"], episode_folder, turns=tts_script.get("turns"))
+            models_used = metadata.get("models_used", {})
+            models_used["audio_generation"] = self.tts_model
+            self.store.update_metadata(episode_folder, {
+                "voices": self.voices if turns else {self.host: self.voices[self.host]},
+                "rerendered_at": datetime.now().isoformat(),
+                "tts_script": self.tts_script_metadata(tts_script),
+                "models_used": models_used,
+                "usage": self.usage.episode_summary(),
+                "duration": self.record_duration(duration, audio_success),
+            })
+            return audio_success
+        except Exception as e:
+            print(f"❌ Error re-rendering {episode_folder.name}: {e}")
+            return False
+        finally:
+            self.voices = previous_voices
+    
+    def render_episode_variants(self, episode_name):
+        """Render the configured variants of an existing episode from its saved script"""
+        if not self.variants:
+            print("⚠️ No variants configured (use --variant-voice and/or --language)")
+            return False
+        episode_folder = self.resolve_episode_folder(episode_name)
+        script = self.read_script(episode_folder, episode_name)
+        if script is None:
+            return False
+        if not self.budget_allows(
+            episode_folder.name, renderings=len(self.variants), translations=self.variant_translations()
+        ):
+            return False
+        
+        print(f"\n🔀 Variants of: {episode_folder.name}")
+        metadata = self.store.load_metadata(episode_folder)
+        episode_data = {
+            "episode_title": metadata.get("episode_title", episode_folder.name),
+            "episode_description": metadata.get("episode_description", ""),
+            "episode_transcript": script,
+        }
+        if metadata.get("mode") == "dialogue":
+            speakers = list(metadata.get("voices") or self.voices)
+            episode_data["episode_turns"] = self.parse_dialogue(episode_data["episode_transcript"], speakers)
+        
+        self.usage.start_episode()
+        with self.profile_stage(episode_folder.name, "variants"):
+            results = self.render_variants(episode_folder, episode_data)
+        self.record_variants(episode_folder, results)
+        return all(result["has_audio"] for result in results.values())
+    
+    def collect_garbage(self, dry_run=False):
+        """Delete artifact blobs that no episode or variant references"""
+        removed, freed = self.store.collect_garbage(dry_run=dry_run)
+        verb = "Would remove" if dry_run else "Removed"
+        print(f"🧹 {verb} {removed} unreferenced blob(s), {freed / 2**20:.1f} MB")
+        return True
+    
+    def export_episode(self, episode_name):
+        """Write an episode's files (script, audio, showtext...) from the artifact store"""
+        episode_folder = self.resolve_episode_folder(episode_name)
+        if not (episode_folder / "metadata.json").exists():
+            print(f"❌ No metadata.json found for episode: {episode_name}")
+            return False
+        if not episode_folder.resolve().is_relative_to(self.output_dir.resolve()):
+            # Its blobs live in another output directory's store
+            print(f"❌ {episode_folder} is not in {self.output_dir}/ (use --fake for {FAKE_OUTPUT_DIR}/)")
+            return False
+        written = self.store.export(episode_folder)
+        for metadata_file in (episode_folder / VARIANTS_DIR_NAME).glob("*/metadata.json"):
+            written += self.store.export(metadata_file.parent)
+        print(f"📦 Exported {len(written)} file(s) to {episode_folder}")
+        return True
+
+
+def bench_startup(runs=5, max_ms=250.0):
+    """Time CLI startup for the lightweight subcommands and guard against SDK imports"""
+    script = str(Path(__file__).resolve())
+    
+    def timed(command):
+        started = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True)
+        return (time.perf_counter() - started) * 1000, result
+    
+    def median(values):
+        return sorted(values)[len(values) // 2]
+    
+    baseline_ms = median([timed([sys.executable, "-c", "pass"])[0] for _ in range(runs)])
+    sdk_ms = median([timed([sys.executable, "-c", "import google.genai"])[0] for _ in range(runs)])
+    
+    print(f"⏱️ Python interpreter:       {baseline_ms:7.1f} ms")
+    print(f"⏱️ Gemini SDK import:        {sdk_ms:7.1f} ms (avoided by lightweight commands)")
+    
+    failed = False
+    for command in ("status", "list"):
+        command_ms = median([timed([sys.executable, script, command])[0] for _ in range(runs)])
+        verdict = "✅" if command_ms <= max_ms else "❌"
+        failed = failed or command_ms > max_ms
+        print(f"{verdict} generate_episodes {command:8} {command_ms:7.1f} ms (limit {max_ms:.0f} ms)")
+    
+    # The SDK must not be imported at all unless a network stage runs
+    probe = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import generate_episodes; "
+        "generate_episodes.main(['status']); sys.exit(3 if 'google.genai' in sys.modules else 0)"
+    )
+    _, result = timed([sys.executable, "-c", probe, str(Path(script).parent)])
+    if result.returncode == 3:
+        print("❌ google.genai was imported by the status command")
+        failed = True
+    elif result.returncode != 0:
+        print(f"❌ status command failed: {result.stderr.strip()}")
+        failed = True
+    else:
+        print("✅ google.genai not imported by lightweight commands")
+    
+    return 1 if failed else 0
 
 
-def main():
+def build_parser():
+    """Command-line interface; running without a subcommand is the same as 'run'"""
+    parser = argparse.ArgumentParser(description="Gemini Podcast Generator")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    run_parser = subparsers.add_parser("run", help="process every prompt in prompts/")
+    run_parser.add_argument("--stream-port", type=int, help="serve in-progress episodes on this port")
+    run_parser.add_argument("--dialogue", action="store_true", default=None, help="two-host dialogue episodes")
+    run_parser.add_argument("--voice", action="append", metavar="SPEAKER=VOICE", help="voice for a speaker (repeatable)")
+    run_parser.add_argument("--variant-voice", action="append", metavar="VOICE|SPEAKER=VOICE,...", help="also render with these voices (repeatable)")
+    run_parser.add_argument("--language", action="append", metavar="CODE", help="also render in this language, e.g. he (repeatable)")
+    run_parser.add_argument("--fake", action="store_true", help=f"use the offline fake backend (writes to {FAKE_OUTPUT_DIR}/)")
+    run_parser.add_argument("--profile", action="store_true", help="profile CPU and memory per episode and stage")
+    
+    subparsers.add_parser("status", help="show pending prompts, episodes and spend")
+    subparsers.add_parser("list", help="list generated episodes")
+    
+    rerender_parser = subparsers.add_parser("rerender", help="regenerate audio from an episode's script")
+    rerender_parser.add_argument("episodes", nargs="+", help="episode folder names or paths")
+    rerender_parser.add_argument("--stream-port", type=int, help="serve in-progress episodes on this port")
+    rerender_parser.add_argument("--voice", action="append", metavar="SPEAKER=VOICE", help="voice for a speaker (repeatable)")
+    rerender_parser.add_argument("--fake", action="store_true", help=f"use the offline fake backend (reads from {FAKE_OUTPUT_DIR}/)")
+    rerender_parser.add_argument("--profile", action="store_true", help="profile CPU and memory per episode and stage")
+    
+    variants_parser = subparsers.add_parser("variants", help="render other voices/languages of existing episodes")
+    variants_parser.add_argument("episodes", nargs="+", help="episode folder names or paths")
+    variants_parser.add_argument("--variant-voice", action="append", metavar="VOICE|SPEAKER=VOICE,...", help="render with these voices (repeatable)")
+    variants_parser.add_argument("--language", action="append", metavar="CODE", help="render in this language, e.g. he (repeatable)")
+    variants_parser.add_argument("--stream-port", type=int, help="serve in-progress episodes on this port")
+    variants_parser.add_argument("--fake", action="store_true", help=f"use the offline fake backend (reads from {FAKE_OUTPUT_DIR}/)")
+    variants_parser.add_argument("--profile", action="store_true", help="profile CPU and memory per episode")
+    
+    export_parser = subparsers.add_parser("export", help="write episode files from the artifact store")
+    export_parser.add_argument("episodes", nargs="*", help="episode folder names or paths (default: all)")
+    export_parser.add_argument("--fake", action="store_true", help=f"export from {FAKE_OUTPUT_DIR}/ instead")
+    
+    gc_parser = subparsers.add_parser("gc", help="delete stored artifacts no episode references")
+    gc_parser.add_argument("--dry-run", action="store_true", help="only report what would be removed")
+    gc_parser.add_argument("--fake", action="store_true", help=f"collect in {FAKE_OUTPUT_DIR}/ instead")
+    
+    bench_parser = subparsers.add_parser("bench", help="benchmark CLI startup time")
+    bench_parser.add_argument("--runs", type=int, default=5)
+    bench_parser.add_argument("--max-ms", type=float, default=250.0)
+    return parser
+
+
+def main(argv=None):
     """Main entry point"""
+    args = build_parser().parse_args(argv)
+    command = args.command or "run"
+    
+    if command == "bench":
+        return bench_startup(runs=args.runs, max_ms=args.max_ms)
+    
+    # Load environment variables from .env file
+    load_dotenv()
+    
+    profiler = None
+    if getattr(args, "profile", False):
+        from profiling import Profiler
+        profiler = Profiler(preload=["google.genai", "gemini_transport"])
+    
     try:
-        generator = PodcastGenerator()
-        generator.process_all_prompts()
+        generator = PodcastGenerator(
+            stream_port=getattr(args, "stream_port", None),
+            dialogue=getattr(args, "dialogue", None),
+            voices=getattr(args, "voice", None),
+            fake=getattr(args, "fake", False),
+            profiler=profiler,
+            variant_voices=getattr(args, "variant_voice", None),
+            languages=getattr(args, "language", None),
+        )
+        if command == "status":
+            generator.print_status()
+        elif command == "list":
+            generator.print_episode_list()
+        elif command == "rerender":
+            generator.calibrate_durations()
+            generator.start_live_server()
+            try:
+                generator.warm_up()
+                results = [generator.rerender_episode(name) for name in args.episodes]
+            finally:
+                generator.stop_live_server()
+            generator.print_transport_stats()
+            generator.write_profile_summary()
+            return 0 if all(results) else 1
+        elif command == "variants":
+            generator.start_live_server()
+            try:
+                generator.warm_up()
+                results = [generator.render_episode_variants(name) for name in args.episodes]
+            finally:
+                generator.stop_live_server()
+            print(f"💰 Run cost: ${generator.usage.run_cost():.4f}")
+            generator.print_transport_stats()
+            generator.write_profile_summary()
+            return 0 if all(results) else 1
+        elif command == "gc":
+            generator.collect_garbage(dry_run=args.dry_run)
+        elif command == "export":
+            names = args.episodes or [episode["folder"] for episode in generator.list_episodes()]
+            return 0 if all([generator.export_episode(name) for name in names]) else 1
+        else:
+            generator.process_all_prompts()
     except Exception as e:
         print(f"❌ Fatal error: {e}")
         return 1
@@ -0,0 +1,207 @@
+"""
+Profiling Harness
+
+Enabled with `run --profile` (or `rerender --profile`). Every pipeline stage
+of every episode is wrapped with:
+- cProfile (calling thread), saved as .pstats plus a top-functions report
+- a stack sampler covering all threads (TTS groups run in workers), saved
+  as collapsed stacks that flamegraph.pl / speedscope / inferno read directly
+- tracemalloc snapshots before and after, reported as top allocations
+- resident memory sampling, reported as peak RSS during the stage
+
+Output goes to profiles/<run timestamp>/<episode>/<stage>.* with a
+summary.json for the run. Combine with `--fake` to profile against the
+offline backend, so runs are reproducible and cost nothing.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_SAMPLE_INTERVAL = 0.005
+TRACEMALLOC_FRAMES = 8
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 25
+
+# Allocations made by imports and by tracemalloc itself are noise in stage reports
+ALLOCATION_FILTERS = (
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+)
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss():
+    """Resident set size in bytes (Linux /proc, else the process peak)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        if resource is None:
+            return 0
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _frame_stack(frame):
+    """Root-first 'function (file:line)' names for a frame"""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+class StackSampler:
+    """Samples every thread's stack and the process RSS at a fixed interval"""
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.peak_rss = 0
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiling-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.is_set():
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                thread_name = names.get(thread_id, str(thread_id)).split(" ")[0]
+                self.stacks[";".join([thread_name] + _frame_stack(frame))] += 1
+            self.peak_rss = max(self.peak_rss, current_rss())
+            self.samples += 1
+            self._stop.wait(self.interval)
+
+    def collapsed(self):
+        """Folded-stack text ('frame;frame;frame count' per line)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class Profiler:
+    """Collects per-episode, per-stage profiles for one run"""
+
+    def __init__(self, root="profiles", sample_interval=DEFAULT_SAMPLE_INTERVAL, preload=()):
+        self.run_dir = Path(root) / datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.sample_interval = sample_interval
+        self.summary = []
+        # Import heavy modules before tracing starts: tracing an import as large
+        # as the Gemini SDK is very slow and its allocations are not of interest
+        for module in preload:
+            __import__(module)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        print(f"🔬 Profiling enabled, writing to {self.run_dir}")
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(ALLOCATION_FILTERS)
+
+    @contextmanager
+    def stage(self, episode, stage):
+        """Profile one stage of one episode"""
+        out_dir = self.run_dir / episode
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        sampler = StackSampler(self.sample_interval)
+        profile = cProfile.Profile()
+        tracemalloc.reset_peak()
+        before = self._snapshot()
+        rss_before = current_rss()
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+
+        sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            sampler.stop()
+            wall = time.perf_counter() - wall_started
+            cpu = time.process_time() - cpu_started
+            after = self._snapshot()
+            _, traced_peak = tracemalloc.get_traced_memory()
+            self._write_stage(out_dir, stage, profile, sampler, before, after)
+            entry = {
+                "episode": episode,
+                "stage": stage,
+                "wall_seconds": round(wall, 4),
+                "cpu_seconds": round(cpu, 4),
+                "samples": sampler.samples,
+                "rss_before_mb": round(rss_before / 2**20, 1),
+                "peak_rss_mb": round(max(sampler.peak_rss, current_rss()) / 2**20, 1),
+                "traced_peak_mb": round(traced_peak / 2**20, 2),
+            }
+            self.summary.append(entry)
+            print(
+                f"🔬 {episode}/{stage}: {entry['wall_seconds']}s wall, {entry['cpu_seconds']}s CPU, "
+                f"peak RSS {entry['peak_rss_mb']} MB, traced peak {entry['traced_peak_mb']} MB"
+            )
+
+    def _write_stage(self, out_dir, stage, profile, sampler, before, after):
+        profile.dump_stats(out_dir / f"{stage}.pstats")
+
+        report = io.StringIO()
+        pstats.Stats(profile, stream=report).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        (out_dir / f"{stage}.functions.txt").write_text(report.getvalue(), encoding="utf-8")
+
+        (out_dir / f"{stage}.collapsed").write_text(sampler.collapsed(), encoding="utf-8")
+
+        lines = [f"Top {TOP_ALLOCATIONS} allocation sites during {stage} (net change, by line)", ""]
+        for stat in after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]:
+            lines.append(str(stat))
+        lines += ["", "Largest net allocations during the stage (traceback)", ""]
+        for stat in after.compare_to(before, "traceback")[:5]:
+            lines.append(f"{stat.size_diff / 1024:+.1f} KiB in {stat.count_diff:+d} blocks")
+            lines.extend(f"    {line}" for line in stat.traceback.format(limit=TRACEMALLOC_FRAMES))
+        (out_dir / f"{stage}.allocations.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    def write_summary(self):
+        """Write summary.json and print per-stage totals"""
+        if not self.summary:
+            return
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        totals = {}
+        for entry in self.summary:
+            stage_total = totals.setdefault(entry["stage"], {"wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_rss_mb": 0.0})
+            stage_total["wall_seconds"] = round(stage_total["wall_seconds"] + entry["wall_seconds"], 4)
+            stage_total["cpu_seconds"] = round(stage_total["cpu_seconds"] + entry["cpu_seconds"], 4)
+            stage_total["peak_rss_mb"] = max(stage_total["peak_rss_mb"], entry["peak_rss_mb"])
+        with open(self.run_dir / "summary.json", "w", encoding="utf-8") as f:
+            json.dump({"stages": self.summary, "totals": totals}, f, indent=2)
+        print(f"🔬 Profile summary written to {self.run_dir / 'summary.json'}")
+        for stage, total in totals.items():
+            print(f"   {stage:10} {total['wall_seconds']:8.3f}s wall {total['cpu_seconds']:8.3f}s CPU  peak RSS {total['peak_rss_mb']} MB")
@@ -0,0 +1,281 @@
+"""
+Live Episode Streaming
+
+A small local HTTP server that lets you listen to an episode while it is
+still being synthesized. Audio chunks are forwarded to every connected
+listener as soon as they arrive from the TTS stream, using chunked
+transfer encoding.
+
+Routes:
+- /            JSON list of live and finished streams
+- /live        the most recently started stream
+- /live/<slug> a specific episode's stream (variants: /live/<slug>/variants/<variant>)
+
+Raw PCM from the TTS model is served as WAV with a streaming header (the
+size fields are set to their maximum, as the final length is unknown).
+Already-encoded audio is forwarded as-is with its own content type.
+Listeners that join late first receive everything buffered so far. Only
+the most recent finished streams stay buffered; older ones are dropped
+once their last listener has disconnected.
+Dialogue episodes synthesized in concurrent groups are forwarded in order.
+"""
+
+import json
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STREAMING_SIZE = 0xFFFFFFFF
+
+# Finished streams kept in memory for late listeners (each holds a whole episode)
+DEFAULT_KEEP_FINISHED = 2
+
+
+def streaming_wav_header(sample_rate, bits_per_sample, num_channels=1):
+    """WAV header for a stream of unknown length"""
+    bytes_per_sample = bits_per_sample // 8
+    block_align = num_channels * bytes_per_sample
+    byte_rate = sample_rate * block_align
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        STREAMING_SIZE,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        num_channels,
+        sample_rate,
+        byte_rate,
+        block_align,
+        bits_per_sample,
+        b"data",
+        STREAMING_SIZE,
+    )
+
+
+class LiveStream:
+    """Buffer for one in-progress episode, shared by all of its listeners"""
+
+    def __init__(self, slug):
+        self.slug = slug
+        self.content_type = None
+        self.chunks = []
+        self.closed = False
+        self.listeners = 0
+        self.started_at = time.time()
+        self.first_audio_at = None
+        self._condition = threading.Condition()
+
+    def start(self, content_type, header=b""):
+        """Set the stream format; called once, when the first audio chunk arrives"""
+        with self._condition:
+            self.content_type = content_type
+            if header:
+                self.chunks.append(header)
+            self.first_audio_at = time.time()
+            self._condition.notify_all()
+
+    def write(self, data):
+        """Append audio data and wake up listeners"""
+        with self._condition:
+            self.chunks.append(data)
+            self._condition.notify_all()
+
+    def close(self):
+        """Mark the stream as complete"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def wait_started(self, timeout):
+        """Block until the stream format is known or the stream closes"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.content_type or self.closed, timeout)
+            return self.content_type
+
+    def iter_chunks(self, idle_timeout):
+        """Yield buffered chunks, then new ones as they arrive, until closed"""
+        index = 0
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: index < len(self.chunks) or self.closed, idle_timeout)
+                pending = self.chunks[index:]
+                index += len(pending)
+                finished = self.closed and index == len(self.chunks)
+            if not pending and not finished:
+                # Idle for too long without new audio: give up on this listener
+                return
+            for chunk in pending:
+                yield chunk
+            if finished:
+                return
+
+    def describe(self):
+        """Summary used by the index route"""
+        return {
+            "slug": self.slug,
+            "content_type": self.content_type,
+            "bytes": sum(len(chunk) for chunk in self.chunks),
+            "finished": self.closed,
+            "seconds_to_first_audio": (
+                round(self.first_audio_at - self.started_at, 2) if self.first_audio_at else None
+            ),
+        }
+
+
+class OrderedStreamWriter:
+    """Forwards audio from concurrently synthesized groups in group order.
+
+    Chunks of the group currently playing are forwarded immediately; chunks
+    of later groups are held until every earlier group has finished.
+    """
+
+    def __init__(self, forward, groups):
+        self.forward = forward
+        self.pending = [[] for _ in range(groups)]
+        self.finished = [False] * groups
+        self.current = 0
+        self._lock = threading.Lock()
+
+    def write(self, index, item):
+        with self._lock:
+            if index == self.current:
+                self.forward(item)
+            else:
+                self.pending[index].append(item)
+
+    def finish(self, index):
+        with self._lock:
+            self.finished[index] = True
+            while self.current < len(self.finished) and self.finished[self.current]:
+                self.current += 1
+                if self.current < len(self.pending):
+                    for item in self.pending[self.current]:
+                        self.forward(item)
+                    self.pending[self.current] = []
+
+
+class LiveStreamServer:
+    """Threaded HTTP server publishing LiveStreams"""
+
+    def __init__(self, host="127.0.0.1", port=8765, idle_timeout=120, keep_finished=DEFAULT_KEEP_FINISHED):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.keep_finished = keep_finished
+        self.streams = {}
+        self.latest = None
+        self._lock = threading.Lock()
+        self._listeners = 0
+        self._httpd = None
+        self._thread = None
+
+    def start(self):
+        """Start serving in a background thread"""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"📡 Live stream available at http://{self.host}:{self.port}/live")
+        return self
+
+    def open_stream(self, slug):
+        """Register a new in-progress episode"""
+        stream = LiveStream(slug)
+        with self._lock:
+            self.streams[slug] = stream
+            self.latest = slug
+            self._evict_finished()
+        print(f"📡 Streaming {slug} at http://{self.host}:{self.port}/live/{slug}")
+        return stream
+
+    def _evict_finished(self):
+        """Drop the oldest finished streams nobody is listening to (call with the lock held)"""
+        finished = [stream for stream in self.streams.values() if stream.closed]
+        for stream in finished[:max(0, len(finished) - self.keep_finished)]:
+            if stream.listeners == 0:
+                del self.streams[stream.slug]
+                stream.chunks = []
+
+    def stop(self, drain_timeout=None):
+        """Stop the server, first letting connected listeners drain their buffers"""
+        if self._httpd is None:
+            return
+        deadline = time.time() + (self.idle_timeout if drain_timeout is None else drain_timeout)
+        while self._listeners and time.time() < deadline:
+            time.sleep(0.2)
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._httpd = None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0].rstrip("/")
+                if path == "":
+                    self._send_index()
+                elif path == "/live":
+                    self._send_stream(server.latest)
+                elif path.startswith("/live/"):
+                    self._send_stream(path[len("/live/"):])
+                else:
+                    self.send_error(404)
+
+            def _send_index(self):
+                with server._lock:
+                    body = json.dumps(
+                        {"latest": server.latest, "streams": [s.describe() for s in server.streams.values()]},
+                        indent=2,
+                    ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_stream(self, slug):
+                stream = server.streams.get(slug) if slug else None
+                if stream is None:
+                    self.send_error(404, "No such stream")
+                    return
+
+                content_type = stream.wait_started(server.idle_timeout)
+                if not content_type:
+                    self.send_error(503, "No audio produced")
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+
+                with server._lock:
+                    server._listeners += 1
+                    stream.listeners += 1
+                try:
+                    for chunk in stream.iter_chunks(server.idle_timeout):
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                        self.wfile.flush()
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with server._lock:
+                        server._listeners -= 1
+                        stream.listeners -= 1
+                        server._evict_finished()
+                    self.close_connection = True
+
+        return Handler
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import time
+
+import pytest
+
+from artifact_store import ArtifactStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(tmp_path)
+
+
+def age(store, digest, seconds=2 * 3600):
+    """Backdate a blob past the gc grace period"""
+    blob = store.find_blob(digest)[0]
+    old = time.time() - seconds
+    os.utime(blob, (old, old))
+
+
+def test_commit_writes_blobs_views_and_metadata(store, tmp_path):
+    episode = tmp_path / "episode"
+    with store.batch(episode) as batch:
+        batch.add("script.txt", "Hello.")
+        batch.add("episode.mp3", b"audio")
+        batch.update_metadata({"episode_title": "Title", "episode_description": "About it"})
+
+    metadata = json.loads((episode / "metadata.json").read_text())
+    assert metadata["episode_title"] == "Title"
+    assert metadata["artifacts"]["script.txt"] == {"sha256": hashlib.sha256(b"Hello.").hexdigest(), "size": 6}
+    assert (episode / "script.txt").read_text() == "Hello."
+    assert (episode / "showtext.txt").read_text() == "Title\nAbout it"
+    # Audio views share the blob's inode, text views are editable copies
+    audio_blob = store.find_blob(metadata["artifacts"]["episode.mp3"]["sha256"])[0]
+    assert os.path.samefile(episode / "episode.mp3", audio_blob)
+    assert not os.path.samefile(episode / "script.txt", store.find_blob(metadata["artifacts"]["script.txt"]["sha256"])[0])
+
+
+def test_commit_merges_unless_fresh(store, tmp_path):
+    episode = tmp_path / "episode"
+    with store.batch(episode) as batch:
+        batch.add("script.txt", "One.")
+        batch.update_metadata({"episode_title": "Title"})
+    with store.batch(episode) as batch:
+        batch.add("episode.mp3", b"audio")
+    assert set(store.load_metadata(episode)["artifacts"]) == {"script.txt", "episode.mp3"}
+
+    with store.batch(episode, fresh=True) as batch:
+        batch.add("script.txt", "Two.")
+    metadata = store.load_metadata(episode)
+    assert set(metadata["artifacts"]) == {"script.txt"}
+    assert "episode_title" not in metadata
+
+
+def test_batch_is_not_committed_on_error(store, tmp_path):
+    episode = tmp_path / "episode"
+    with pytest.raises(RuntimeError):
+        with store.batch(episode) as batch:
+            batch.add("script.txt", "Hello.")
+            raise RuntimeError("failed")
+    assert not (episode / "metadata.json").exists()
+
+
+def test_identical_content_is_stored_once(store, tmp_path):
+    for name in ("one", "two"):
+        with store.batch(tmp_path / name) as batch:
+            batch.add("episode.mp3", b"same audio")
+    assert len(list(store.blob_dir.rglob("*"))) == 2  # one prefix directory, one blob
+
+
+def test_compressed_store_writes_no_views(tmp_path):
+    store = ArtifactStore(tmp_path, compression="gzip")
+    episode = tmp_path / "episode"
+    with store.batch(episode) as batch:
+        batch.add("script.txt", "Hello.")
+        batch.update_metadata({"episode_title": "Title"})
+    assert not (episode / "script.txt").exists()
+    assert not (episode / "showtext.txt").exists()
+    assert store.read_artifact(episode, "script.txt") == b"Hello."
+    assert {path.name for path in store.export(episode)} == {"script.txt", "showtext.txt"}
+
+
+def test_get_verifies_hash(store):
+    digest = store.put(b"audio")
+    blob = store.find_blob(digest)[0]
+    os.chmod(blob, 0o644)
+    blob.write_bytes(b"tampered")
+    with pytest.raises(ValueError, match="corrupt"):
+        store.get(digest)
+
+
+def test_get_missing_blob(store):
+    with pytest.raises(FileNotFoundError):
+        store.get("0" * 64)
+
+
+def test_edited_text_view_is_adopted(store, tmp_path):
+    episode = tmp_path / "episode"
+    with store.batch(episode) as batch:
+        batch.add("script.txt", "Original.")
+    (episode / "script.txt").write_text("Edited.")
+
+    assert store.read_artifact(episode, "script.txt") == b"Edited."
+    ref = store.load_metadata(episode)["artifacts"]["script.txt"]
+    assert ref["sha256"] == hashlib.sha256(b"Edited.").hexdigest()
+    assert store.get(ref["sha256"]) == b"Edited."
+
+
+def test_edit_through_hard_link_drops_the_old_blob(store, tmp_path):
+    episode = tmp_path / "episode"
+    with store.batch(episode) as batch:
+        batch.add("episode.mp3", b"audio")
+    old_digest = store.load_metadata(episode)["artifacts"]["episode.mp3"]["sha256"]
+    view = episode / "episode.mp3"
+    os.chmod(view, 0o644)
+    view.write_bytes(b"edited audio")
+
+    assert store.read_artifact(episode, "episode.mp3") == b"edited audio"
+    assert store.find_blob(old_digest)[0] is None
+    assert store.load_metadata(episode)["artifacts"]["episode.mp3"]["sha256"] == hashlib.sha256(b"edited audio").hexdigest()
+
+
+def test_referenced_digests_include_variants(store, tmp_path):
+    with store.batch(tmp_path / "episode") as batch:
+        batch.add("script.txt", "Hello.")
+    with store.batch(tmp_path / "episode" / "variants" / "de-puck") as batch:
+        batch.add("episode.mp3", b"variant audio")
+    assert store.referenced_digests() == {
+        hashlib.sha256(b"Hello.").hexdigest(),
+        hashlib.sha256(b"variant audio").hexdigest(),
+    }
+
+
+def test_collect_garbage_removes_only_unreferenced_blobs(store, tmp_path):
+    with store.batch(tmp_path / "episode") as batch:
+        batch.add("episode.mp3", b"old audio")
+    old_digest = store.load_metadata(tmp_path / "episode")["artifacts"]["episode.mp3"]["sha256"]
+    with store.batch(tmp_path / "episode") as batch:
+        batch.add("episode.mp3", b"new audio")
+    with store.batch(tmp_path / "episode" / "variants" / "de-puck") as batch:
+        batch.add("episode.mp3", b"variant audio")
+    for digest in (old_digest, *store.referenced_digests()):
+        age(store, digest)
+
+    assert store.collect_garbage(dry_run=True) == (1, len(b"old audio"))
+    assert store.find_blob(old_digest)[0] is not None
+
+    assert store.collect_garbage() == (1, len(b"old audio"))
+    assert store.find_blob(old_digest)[0] is None
+    assert store.read_artifact(tmp_path / "episode", "episode.mp3") == b"new audio"
+    assert store.read_artifact(tmp_path / "episode" / "variants" / "de-puck", "episode.mp3") == b"variant audio"
+
+
+def test_collect_garbage_keeps_blobs_within_grace_period(store):
+    recent = store.put(b"just written")
+    old = store.put(b"long gone")
+    age(store, old)
+
+    assert store.collect_garbage() == (1, len(b"long gone"))
+    assert store.find_blob(recent)[0] is not None
+    assert store.collect_garbage(grace_seconds=-60) == (1, len(b"just written"))
+
+
+def test_collect_garbage_skips_temporary_files(store):
+    digest = store.put(b"audio")
+    age(store, digest)
+    tmp = store.blob_path(digest).parent / ".in-flight.tmp"
+    tmp.write_bytes(b"partial")
+    os.utime(tmp, (0, 0))
+
+    assert store.collect_garbage() == (1, len(b"audio"))
+    assert tmp.exists()
+
+
+def test_collect_garbage_aborts_on_unreadable_metadata(store, tmp_path):
+    digest = store.put(b"audio")
+    age(store, digest)
+    (tmp_path / "episode").mkdir()
+    (tmp_path / "episode" / "metadata.json").write_text('{"artifacts": {')
+
+    with pytest.raises(ValueError, match="not collecting garbage"):
+        store.collect_garbage()
+    assert store.find_blob(digest)[0] is not None
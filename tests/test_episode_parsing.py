@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from generate_episodes import PodcastGenerator
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ("PODCAST_MODE", "HOST_VOICES", "VARIANT_VOICES", "VARIANT_LANGUAGES"):
+        monkeypatch.delenv(name, raising=False)
+    return PodcastGenerator(fake=True)
+
+
+EPISODE = {
+    "episode_title": "Firewalls",
+    "episode_description": "Why firewalls deny by default.",
+    "episode_transcript": "Welcome back. Today we talk about firewalls.\n\nThey deny by default.",
+}
+
+
+@pytest.mark.parametrize("response_text", [
+    json.dumps(EPISODE),
+    "```json\n" + json.dumps(EPISODE, indent=2) + "\n```",
+    "```\n" + json.dumps(EPISODE) + "\n```",
+    json.dumps(json.dumps(EPISODE)),
+    "Here is the episode:\n" + json.dumps(EPISODE) + "\nEnjoy!",
+])
+def test_parse_recovers_wrapped_json(generator, response_text):
+    assert generator.parse_episode_response(response_text) == (EPISODE, [])
+
+
+def test_parse_allows_raw_newlines_in_strings(generator):
+    response_text = json.dumps(EPISODE).replace("\\n", "\n")
+    assert generator.parse_episode_response(response_text) == (EPISODE, [])
+
+
+def test_parse_drops_non_string_and_empty_fields(generator):
+    response_text = json.dumps({
+        "episode_title": ["Firewalls"],
+        "episode_description": "   ",
+        "episode_transcript": EPISODE["episode_transcript"],
+    })
+    episode_data, missing = generator.parse_episode_response(response_text)
+    assert episode_data == {"episode_transcript": EPISODE["episode_transcript"]}
+    assert missing == ["episode_title", "episode_description"]
+
+
+def test_parse_salvages_truncated_transcript(generator):
+    response_text = json.dumps(EPISODE)[:-1].replace("by default.\"", "by default. And then th")
+    episode_data, missing = generator.parse_episode_response(response_text)
+    assert missing == []
+    assert episode_data["episode_title"] == EPISODE["episode_title"]
+    assert episode_data["episode_transcript"] == EPISODE["episode_transcript"]
+
+
+def test_parse_reports_fields_never_written(generator):
+    response_text = '{"episode_title": "Firewalls", "episode_desc'
+    assert generator.parse_episode_response(response_text) == ({"episode_title": "Firewalls"}, [
+        "episode_description",
+        "episode_transcript",
+    ])
+
+
+@pytest.mark.parametrize("text, transcript", [
+    # Cut back to the last complete sentence
+    ('"episode_transcript": "One sentence here. Another one here. And a thi', "One sentence here. Another one here."),
+    ('"episode_transcript": "He said \\"no.\\" Then she said \\"yes.\\" And th', 'He said "no." Then she said "yes."'),
+    ('"episode_transcript": "First part. Second part.', "First part. Second part."),
+    # No sentence end in the second half: kept as is
+    ('"episode_transcript": "Short. Then a long sentence that never gets to its', "Short. Then a long sentence that never gets to its"),
+])
+def test_salvage_truncated_field(generator, text, transcript):
+    assert generator.salvage_episode_fields(text) == {"episode_transcript": transcript}
+
+
+def test_salvage_warns_when_kept_mid_sentence(generator, capsys):
+    generator.salvage_episode_fields('"episode_transcript": "A sentence that never')
+    assert "episode_transcript was cut off mid-sentence" in capsys.readouterr().out
+
+
+def test_salvage_matches_escaped_keys(generator):
+    text = '{"episode\\_title": "Firewalls", "episode_transcript": "Hello."}'
+    assert generator.salvage_episode_fields(text) == {"episode_title": "Firewalls", "episode_transcript": "Hello."}
+
+
+@pytest.mark.parametrize("raw, decoded", [
+    ("plain text", "plain text"),
+    ('line one\\nline \\"two\\"', 'line one\nline "two"'),
+    ("caf\\u00e9", "café"),
+    ("C:\\Windows and \\d+", "C:Windows and d+"),
+    ("ends with a backslash\\", "ends with a backslash"),
+    ("keeps an escaped backslash\\\\", "keeps an escaped backslash\\"),
+    ("raw\nnewline", "raw\nnewline"),
+    ("partial \\u00", "partial \\u00"),
+])
+def test_decode_json_string(generator, raw, decoded):
+    assert generator._decode_json_string(raw) == decoded
@@ -0,0 +1,172 @@
+import pytest
+
+from tts_normalizer import (
+    normalize_for_tts,
+    normalize_text,
+    number_to_words,
+    ordinal_to_words,
+    split_segments,
+    year_to_words,
+)
+
+
+@pytest.mark.parametrize("number, words", [
+    (0, "zero"),
+    (21, "twenty-one"),
+    (105, "one hundred five"),
+    (1500, "one thousand five hundred"),
+    (2_000_000, "two million"),
+])
+def test_number_to_words(number, words):
+    assert number_to_words(number) == words
+
+
+@pytest.mark.parametrize("number, words", [
+    (1, "first"),
+    (3, "third"),
+    (12, "twelfth"),
+    (20, "twentieth"),
+    (42, "forty-second"),
+])
+def test_ordinal_to_words(number, words):
+    assert ordinal_to_words(number) == words
+
+
+@pytest.mark.parametrize("year, words", [
+    (1998, "nineteen ninety-eight"),
+    (2005, "two thousand five"),
+    (2023, "twenty twenty-three"),
+    (1900, "nineteen hundred"),
+    (1905, "nineteen oh five"),
+])
+def test_year_to_words(year, words):
+    assert year_to_words(year) == words
+
+
+@pytest.mark.parametrize("text, spoken", [
+    ("It costs $20/month.", "It costs twenty dollars per month."),
+    ("Tickets are $1.50 each.", "Tickets are one dollar and fifty cents each."),
+    ("Just $1.", "Just one dollar."),
+    ("Only $0.99 today.", "Only ninety-nine cents today."),
+    ("They raised $2.5 million.", "They raised two point five million dollars."),
+    ("They raised $5M.", "They raised five million dollars."),
+    ("It was €1,500.75.", "It was one thousand five hundred euros and seventy-five cents."),
+    ("About £3.20.", "About three pounds and twenty pence."),
+])
+def test_currency(text, spoken):
+    assert normalize_text(text) == spoken
+
+
+@pytest.mark.parametrize("text, spoken", [
+    ("Rates drop 5%/year.", "Rates drop five percent per year."),
+    ("It runs at 60/s.", "It runs at sixty per second."),
+    ("Downloads hit 100 MB/s.", "Downloads hit one hundred MB per second."),
+    ("Read and/or write.", "Read and or write."),
+    ("Pick input/output.", "Pick input or output."),
+])
+def test_per_unit(text, spoken):
+    assert normalize_text(text) == spoken
+
+
+@pytest.mark.parametrize("text, spoken", [
+    ("On 10/12/2023 we met.", "On October twelfth, twenty twenty-three we met."),
+    ("On 25/12/2023 we met.", "On December twenty-fifth, twenty twenty-three we met."),
+    ("Due 3/4/24.", "Due March fourth, twenty twenty-four."),
+    ("Released 2023-10-12.", "Released October twelfth, twenty twenty-three."),
+])
+def test_dates(text, spoken):
+    assert normalize_text(text) == spoken
+
+
+@pytest.mark.parametrize("text, spoken", [
+    ("Meet at 5:30.", "Meet at five thirty."),
+    ("Meet at 9:05 a.m. sharp.", "Meet at nine oh five a.m. sharp."),
+    ("Meet at 5:00 pm.", "Meet at five p.m."),
+    ("Meet at 3:00.", "Meet at three o'clock."),
+    ("Meet at 16:00.", "Meet at sixteen hundred."),
+])
+def test_times(text, spoken):
+    assert normalize_text(text) == spoken
+
+
+@pytest.mark.parametrize("text, spoken", [
+    ("About 50-60% of users.", "About fifty to sixty percent of users."),
+    ("From 2020-2024 it grew.", "From twenty twenty to twenty twenty-four it grew."),
+    ("Plans cost $10-$20.", "Plans cost ten dollars to twenty dollars."),
+    ("Ages 3–5.", "Ages three to five."),
+    ("Plan for 500-1000 users.", "Plan for five hundred to one thousand users."),
+    ("It ended 3-2.", "It ended three two."),
+])
+def test_ranges(text, spoken):
+    assert normalize_text(text) == spoken
+
+
+@pytest.mark.parametrize("text, spoken", [
+    ("About 1/3 of users.", "About one third of users."),
+    ("Only 3/4 and 1/2 of it.", "Only three quarters and one half of it."),
+    ("Odds are 2/5.", "Odds are two fifths."),
+    ("It's 50/50.", "It's fifty-fifty."),
+    ("A 16:9 screen.", "A sixteen to nine screen."),
+    ("Three to one, or 3:1.", "Three to one, or three to one."),
+])
+def test_fractions_and_ratios(text, spoken):
+    assert normalize_text(text) == spoken
+
+
+@pytest.mark.parametrize("text, spoken", [
+    ("Built for x86-64.", "Built for x86-64."),
+    ("Call 555-1234.", "Call five five five, one two three four."),
+    ("Call 555-123-4567.", "Call five five five, one two three, four five six seven."),
+])
+def test_identifiers_are_not_ranges(text, spoken):
+    assert normalize_text(text) == spoken
+
+
+@pytest.mark.parametrize("text, spoken", [
+    ("It was -5 outside.", "It was minus five outside."),
+    ("Down to −3.5 degrees.", "Down to minus three point five degrees."),
+    ("A loss of -$5.", "A loss of minus five dollars."),
+])
+def test_negative_numbers(text, spoken):
+    assert normalize_text(text) == spoken
+
+
+@pytest.mark.parametrize("text, spoken", [
+    ("The 3rd try ran 24/7.", "The third try ran twenty-four seven."),
+    ("In 1998 we had 1,500 users.", "In nineteen ninety-eight we had one thousand five hundred users."),
+    ("Pi is 3.14.", "Pi is three point one four."),
+    ("COVID-19 and GPT-4.", "COVID-nineteen and GPT-four."),
+])
+def test_plain_numbers_unchanged(text, spoken):
+    assert normalize_text(text) == spoken
+
+
+def test_markdown_and_abbreviations():
+    text = "## Intro\n\n**Key point:** use tools e.g. Gemini (see the [docs](https://example.com/docs))."
+    assert normalize_text(text) == "Intro\n\nKey point: use tools for example Gemini, see the docs."
+
+
+def test_numbered_items():
+    assert normalize_text("1. Plan\n2. Build") == "First, Plan\nSecond, Build"
+
+
+def test_redundant_acronym_dropped():
+    assert normalize_text("Network Address Translation (NAT) hides hosts.") == "Network Address Translation hides hosts."
+
+
+def test_other_languages_keep_numerals():
+    assert normalize_text("**Es kostet** $20/Monat am 10/12/2023.", language="de") == "Es kostet $20/Monat am 10/12/2023."
+
+
+def test_split_segments_bounds_length():
+    text = " ".join(f"Sentence number {index} is here." for index in range(100))
+    segments = split_segments(text, max_chars=200)
+    assert all(len(segment) <= 200 for segment in segments)
+    assert " ".join(segments) == text
+
+
+def test_normalize_for_tts_is_memoized():
+    first = normalize_for_tts("It costs $20/month.")
+    assert normalize_for_tts("It costs $20/month.") is first
+    assert first["segments"] == ["It costs twenty dollars per month."]
+    assert normalize_for_tts("It costs $20/month.", language="de") is not first
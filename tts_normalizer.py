@@ -0,0 +1,399 @@
+"""
+TTS Transcript Normalization
+
+Turns a generated episode transcript into text that reads well aloud:
+- strips markdown (emphasis, headings, bullets, links, code)
+- turns numbered lists into spoken ordinals
+- expands common abbreviations and numerals to words, reading currency,
+  per-unit rates, dates, times, ranges, ratios, fractions, phone numbers
+  and negative numbers in context
+- drops redundant parenthetical acronyms and softens other parentheses
+- collapses whitespace and splits long paragraphs into bounded segments
+
+The word rules (abbreviations, numerals, ordinals) are English. Transcripts
+in other languages only get the markdown and whitespace rules.
+
+All rules are compiled once at import time and results are memoized by
+content hash for the life of the process, so re-normalizing the same
+transcript within a run is free. Saved scripts record the source hash and
+NORMALIZER_VERSION, and rerender reuses a saved tts_script.txt only while
+both still match.
+"""
+
+import hashlib
+import re
+
+# Bump when the rules change, so saved TTS scripts from older rules are re-normalized
+NORMALIZER_VERSION = "3"
+
+DEFAULT_MAX_SEGMENT_CHARS = 1500
+
+ONES = [
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+    "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen",
+    "seventeen", "eighteen", "nineteen",
+]
+TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+SCALES = [(10 ** 12, "trillion"), (10 ** 9, "billion"), (10 ** 6, "million"), (1000, "thousand")]
+ORDINAL_WORDS = {
+    "one": "first", "two": "second", "three": "third", "five": "fifth",
+    "eight": "eighth", "nine": "ninth", "twelve": "twelfth",
+}
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+# Singular, plural, subunit singular, subunit plural
+CURRENCY_NAMES = {
+    "$": ("dollar", "dollars", "cent", "cents"),
+    "€": ("euro", "euros", "cent", "cents"),
+    "£": ("pound", "pounds", "penny", "pence"),
+}
+# Abbreviated units after "per", e.g. 60/s -> sixty per second
+PER_UNIT_NAMES = {
+    "s": "second", "sec": "second", "ms": "millisecond", "min": "minute", "h": "hour", "hr": "hour",
+    "d": "day", "wk": "week", "mo": "month", "yr": "year",
+}
+CURRENCY_SCALES = {
+    "k": "thousand", "m": "million", "b": "billion", "bn": "billion",
+    "thousand": "thousand", "million": "million", "billion": "billion", "trillion": "trillion",
+}
+
+# Markdown and layout rules, applied in order
+MARKDOWN_RULES = [
+    (re.compile(r"```.*?```", re.DOTALL), ""),
+    (re.compile(r"`([^`]*)`"), r"\1"),
+    (re.compile(r"!\[([^\]]*)\]\([^)]*\)"), r"\1"),
+    (re.compile(r"\[([^\]]+)\]\([^)]*\)"), r"\1"),
+    (re.compile(r"https?://(?:www\.)?([^/\s]+)\S*"), r"\1"),
+    (re.compile(r"(\*\*|__)(.+?)\1", re.DOTALL), r"\2"),
+    (re.compile(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])"), r"\1"),
+    (re.compile(r"(?<!\w)_(?!\s)(.+?)(?<!\s)_(?!\w)"), r"\1"),
+    (re.compile(r"^\s{0,3}#{1,6}\s*", re.MULTILINE), ""),
+    (re.compile(r"^\s{0,3}>\s?", re.MULTILINE), ""),
+    (re.compile(r"^\s*[-*+•]\s+", re.MULTILINE), ""),
+    (re.compile(r"^\s*(?:[-*_]\s*){3,}$", re.MULTILINE), ""),
+]
+NUMBERED_ITEM_RE = re.compile(r"^\s*(\d{1,2})[.)]\s+", re.MULTILINE)
+
+# Speakable replacements for abbreviations and symbols
+ABBREVIATION_RULES = [
+    (re.compile(r"\be\.g\.,?", re.IGNORECASE), "for example"),
+    (re.compile(r"\bi\.e\.,?", re.IGNORECASE), "that is"),
+    (re.compile(r"\betc\.(?=\s+[a-z])"), "et cetera"),
+    (re.compile(r"\betc\."), "et cetera."),
+    (re.compile(r"\bvs\.?(?=\s)", re.IGNORECASE), "versus"),
+    (re.compile(r"\bapprox\.(?=\s)", re.IGNORECASE), "approximately"),
+    (re.compile(r"\bw/(?=\s)"), "with"),
+    (re.compile(r"\b24/7\b"), "twenty-four seven"),
+    (
+        re.compile(r"(?<=[\d%])\s?/\s?([A-Za-z]+)\b"),
+        lambda match: " per " + PER_UNIT_NAMES.get(match.group(1), match.group(1)),
+    ),
+    (re.compile(r"\b([KMGT]i?[Bb])/s\b"), r"\1 per second"),
+    (re.compile(r"\s+&\s+"), " and "),
+    (re.compile(r"(?<=\d)\s?%"), " percent"),
+    (re.compile(r"\band/or\b", re.IGNORECASE), "and or"),
+    (re.compile(r"(?<=[A-Za-z])\s*/\s*(?=[A-Za-z])"), " or "),
+]
+
+# An acronym in parentheses right after its expansion, e.g. "Network Address Translation (NAT)"
+PAREN_ACRONYM_RE = re.compile(r"\s*\((?:[A-Z][A-Za-z0-9]*[A-Z][A-Za-z0-9]*s?)(?:\s*(?:/|or)\s*[A-Z][A-Za-z]*)*\)")
+PAREN_ASIDE_RE = re.compile(r"\s*\(([^()]{1,200})\)")
+
+# Numerals whose reading depends on context, applied before the generic number rules
+ISO_DATE_RE = re.compile(r"(?<![\w.,/-])(\d{4})-(\d{2})-(\d{2})(?![\w/-]|[.,]\d)")
+SLASH_DATE_RE = re.compile(r"(?<![\w.,/-])(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})(?![\w/-]|[.,]\d)")
+TIME_RE = re.compile(r"(?<![\w.,:])(\d{1,2}):([0-5]\d)(?![\w:]|[.,]\d)(?:\s?([AaPp])\.?[Mm]\b\.?)?")
+RATIO_RE = re.compile(r"(?<![\w.,:])(\d+):(\d+)(?![\w:]|[.,]\d)")
+FRACTION_RE = re.compile(r"(?<![\w.,/-])(\d{1,2})/(\d{1,3})(?![\w/]|[.,]\d)")
+PHONE_RE = re.compile(r"(?<![\w.,/-])(?:(\d{3})-)?(\d{3})-(\d{4})(?![\w-]|[.,]\d)")
+# Both ends must be standalone numbers, so "x86-64" or "COVID-19" are left alone
+_RANGE_NUMBER = r"(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+RANGE_RE = re.compile(
+    rf"(?<![\w.,/-])([$€£]?){_RANGE_NUMBER}(?:-|\s?\u2013\s?)([$€£]?){_RANGE_NUMBER}(?![\w-]|[.,]\d)"
+)
+NEGATIVE_RE = re.compile(r"(?<![\w.,)\]])[-\u2212](?=[$€£]?\d)")
+CURRENCY_RE = re.compile(
+    r"([$€£])(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d+))?"
+    r"(?:\s?(thousand|million|billion|trillion|[kKmMbB]n?)\b)?(?![\w.,]\d)"
+)
+
+ORDINAL_NUMBER_RE = re.compile(r"\b(\d+)(?:st|nd|rd|th)\b")
+YEAR_RE = re.compile(r"(?<![\w.,])((?:19|20)\d{2})(?!\w|[.,]\d)")
+NUMBER_RE = re.compile(r"(?<![\w.,])(?<!\d-)(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d+))?(?!\w|[.,]\d)")
+
+# Whitespace and punctuation cleanup
+CLEANUP_RULES = [
+    (re.compile(r"[ \t]+"), " "),
+    (re.compile(r" *\n *"), "\n"),
+    (re.compile(r"\n{3,}"), "\n\n"),
+    (re.compile(r",\s*([.,;:!?])"), r"\1"),
+    (re.compile(r"\s+([.,;:!?])"), r"\1"),
+    (re.compile(r":([.!?])"), r"\1"),
+]
+
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+CLAUSE_SPLIT_RE = re.compile(r"(?<=[,;:])\s+")
+
+_cache = {}
+
+
+def number_to_words(number):
+    """Spell out a non-negative integer"""
+    if number < 20:
+        return ONES[number]
+    if number < 100:
+        tens, ones = divmod(number, 10)
+        return TENS[tens] + (f"-{ONES[ones]}" if ones else "")
+    if number < 1000:
+        hundreds, rest = divmod(number, 100)
+        return f"{ONES[hundreds]} hundred" + (f" {number_to_words(rest)}" if rest else "")
+    for scale, name in SCALES:
+        if number >= scale:
+            head, rest = divmod(number, scale)
+            return f"{number_to_words(head)} {name}" + (f" {number_to_words(rest)}" if rest else "")
+    return str(number)
+
+
+def ordinal_to_words(number):
+    """Spell out an ordinal, e.g. 3 -> third"""
+    words = number_to_words(number)
+    prefix, _, last = words.rpartition(" ")
+    if "-" in last:
+        head, _, last = last.rpartition("-")
+        prefix = f"{prefix} {head}-".strip() if prefix else f"{head}-"
+    elif prefix:
+        prefix += " "
+    if last in ORDINAL_WORDS:
+        last = ORDINAL_WORDS[last]
+    elif last.endswith("y"):
+        last = last[:-1] + "ieth"
+    else:
+        last += "th"
+    return prefix + last
+
+
+def year_to_words(year):
+    """Read a year the way people say it, e.g. 1998 -> nineteen ninety-eight"""
+    century, rest = divmod(year, 100)
+    if 2000 <= year < 2010:
+        return number_to_words(year)
+    if rest == 0:
+        return f"{number_to_words(century)} hundred"
+    if rest < 10:
+        return f"{number_to_words(century)} oh {number_to_words(rest)}"
+    return f"{number_to_words(century)} {number_to_words(rest)}"
+
+
+def decimal_to_words(whole, fraction=None):
+    """Spell out a number from its digits, e.g. ("1,500", "25") -> one thousand five hundred point two five"""
+    words = number_to_words(int(whole.replace(",", "")))
+    if fraction is None:
+        return words
+    return f"{words} point " + " ".join(ONES[int(digit)] for digit in fraction)
+
+
+def date_to_words(year, month, day):
+    """Read a date, e.g. (2023, 10, 12) -> October twelfth, twenty twenty-three"""
+    return f"{MONTHS[month - 1]} {ordinal_to_words(day)}, {year_to_words(year)}"
+
+
+def _number_match_to_words(match):
+    return decimal_to_words(match.group(1), match.group(2))
+
+
+def _iso_date_to_words(match):
+    year, month, day = (int(group) for group in match.groups())
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return match.group(0)
+    return date_to_words(year, month, day)
+
+
+def _slash_date_to_words(match):
+    first, second, year = match.groups()
+    month, day = int(first), int(second)
+    if month > 12 and day <= 12:
+        # Day first, e.g. 25/12/2023
+        month, day = day, month
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return match.group(0)
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+    return date_to_words(year, month, day)
+
+
+def _time_to_words(match):
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2)), match.group(3)
+    if hour > 24:
+        return match.group(0)
+    if minute == 0 and (hour == 0 or hour > 12):
+        words = f"{number_to_words(hour)} hundred"
+    elif minute == 0:
+        words = number_to_words(hour) + ("" if meridiem else " o'clock")
+    elif minute < 10:
+        words = f"{number_to_words(hour)} oh {number_to_words(minute)}"
+    else:
+        words = f"{number_to_words(hour)} {number_to_words(minute)}"
+    if meridiem:
+        words += f" {meridiem.lower()}.m."
+    return words
+
+
+def _ratio_to_words(match):
+    return f"{match.group(1)} to {match.group(2)}"
+
+
+def _fraction_to_words(match):
+    numerator, denominator = int(match.group(1)), int(match.group(2))
+    if numerator == denominator:
+        # 50/50 -> fifty-fifty
+        return f"{number_to_words(numerator)}-{number_to_words(denominator)}"
+    if not 0 < numerator < denominator:
+        return match.group(0)
+    if denominator == 2:
+        name = "half" if numerator == 1 else "halves"
+    elif denominator == 4:
+        name = "quarter" + ("s" if numerator > 1 else "")
+    else:
+        name = ordinal_to_words(denominator) + ("s" if numerator > 1 else "")
+    return f"{number_to_words(numerator)} {name}"
+
+
+def _phone_to_words(match):
+    groups = [group for group in match.groups() if group]
+    if len(groups) == 2 and groups[-1].endswith("00"):
+        # Round numbers like 500-1000 are a range, not a phone number
+        return match.group(0)
+    return ", ".join(" ".join(ONES[int(digit)] for digit in group) for group in groups)
+
+
+def _range_to_words(match):
+    first_currency, first, second_currency, second = match.groups()
+    if float(second.replace(",", "")) <= float(first.replace(",", "")):
+        # Not a range (a score like 3-2): read the numbers in turn
+        return f"{first_currency}{first} {second_currency}{second}"
+    return f"{first_currency}{first} to {second_currency}{second}"
+
+
+def _currency_to_words(match):
+    symbol, whole, fraction, scale = match.groups()
+    unit, units, subunit, subunits = CURRENCY_NAMES[symbol]
+    if scale:
+        return f"{decimal_to_words(whole, fraction)} {CURRENCY_SCALES[scale.lower()]} {units}"
+    amount = int(whole.replace(",", ""))
+    if fraction is not None and len(fraction) != 2:
+        return f"{decimal_to_words(whole, fraction)} {units}"
+    parts = []
+    if amount or not fraction or not int(fraction):
+        parts.append(f"{number_to_words(amount)} {unit if amount == 1 else units}")
+    if fraction and int(fraction):
+        cents = int(fraction)
+        parts.append(f"{number_to_words(cents)} {subunit if cents == 1 else subunits}")
+    return " and ".join(parts)
+
+
+def _numbered_item_to_words(match):
+    return f"{ordinal_to_words(int(match.group(1))).capitalize()}, "
+
+
+def _apply(rules, text):
+    for pattern, replacement in rules:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _split_long(text, max_chars, splitter):
+    """Greedily pack pieces produced by splitter into chunks of at most max_chars"""
+    chunks = []
+    current = ""
+    for piece in splitter(text):
+        candidate = f"{current} {piece}" if current else piece
+        if len(candidate) <= max_chars:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+        current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_segments(text, max_chars=DEFAULT_MAX_SEGMENT_CHARS):
+    """Split normalized text into paragraphs no longer than max_chars"""
+    segments = []
+    for paragraph in text.split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            segments.append(paragraph)
+            continue
+        for sentence_group in _split_long(paragraph, max_chars, SENTENCE_SPLIT_RE.split):
+            if len(sentence_group) <= max_chars:
+                segments.append(sentence_group)
+                continue
+            # A single runaway sentence: fall back to clauses, then words
+            for clause_group in _split_long(sentence_group, max_chars, CLAUSE_SPLIT_RE.split):
+                if len(clause_group) <= max_chars:
+                    segments.append(clause_group)
+                else:
+                    segments.extend(_split_long(clause_group, max_chars, str.split))
+    return segments
+
+
+def normalize_text(text, language="en"):
+    """Apply all normalization rules to a transcript"""
+    text = text.replace("\r\n", "\n").replace("\u00a0", " ")
+    text = _apply(MARKDOWN_RULES, text)
+    if language != "en":
+        return _apply(CLEANUP_RULES, text).strip()
+    text = NUMBERED_ITEM_RE.sub(_numbered_item_to_words, text)
+    text = PAREN_ACRONYM_RE.sub("", text)
+    text = PAREN_ASIDE_RE.sub(r", \1,", text)
+    text = _apply(ABBREVIATION_RULES, text)
+    text = ISO_DATE_RE.sub(_iso_date_to_words, text)
+    text = SLASH_DATE_RE.sub(_slash_date_to_words, text)
+    text = TIME_RE.sub(_time_to_words, text)
+    text = RATIO_RE.sub(_ratio_to_words, text)
+    text = FRACTION_RE.sub(_fraction_to_words, text)
+    text = PHONE_RE.sub(_phone_to_words, text)
+    text = RANGE_RE.sub(_range_to_words, text)
+    text = NEGATIVE_RE.sub("minus ", text)
+    text = CURRENCY_RE.sub(_currency_to_words, text)
+    text = ORDINAL_NUMBER_RE.sub(lambda match: ordinal_to_words(int(match.group(1))), text)
+    text = YEAR_RE.sub(lambda match: year_to_words(int(match.group(1))), text)
+    text = NUMBER_RE.sub(_number_match_to_words, text)
+    text = _apply(CLEANUP_RULES, text)
+    return text.strip()
+
+
+def content_hash(text):
+    """Stable hash used to key cached normalizations"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize_for_tts(transcript, max_segment_chars=DEFAULT_MAX_SEGMENT_CHARS, language="en"):
+    """Normalize a transcript for TTS, memoized by content hash.
+
+    Returns a dict with the speakable text, its segments, the hash of the
+    source transcript and the number of characters saved.
+    """
+    source_hash = content_hash(transcript)
+    key = (source_hash, max_segment_chars, language, NORMALIZER_VERSION)
+    if key in _cache:
+        return _cache[key]
+
+    segments = split_segments(normalize_text(transcript, language), max_segment_chars)
+    tts_text = "\n\n".join(segments)
+    result = {
+        "text": tts_text,
+        "segments": segments,
+        "source_sha256": source_hash,
+        "normalizer_version": NORMALIZER_VERSION,
+        "characters_saved": len(transcript) - len(tts_text),
+    }
+    _cache[key] = result
+    return result
@@ -0,0 +1,232 @@
+"""
+Token and Cost Accounting
+
+Records token usage and audio duration for every Gemini call, prices it,
+and keeps a persistent run log (usage-log.jsonl in the output folder) so
+spend can be tracked across runs and capped with a budget.
+
+Budgets come from the environment:
+- RUN_BUDGET_USD    maximum spend for a single run
+- DAILY_BUDGET_USD  maximum spend per calendar day, across runs
+
+The BudgetScheduler decides, before each prompt, whether to process it
+normally, with cheaper models, defer it (low priority only) or stop.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, date
+
+# USD per 1M tokens. Check https://ai.google.dev/gemini-api/docs/pricing when updating.
+MODEL_PRICING = {
+    "gemini-2.5-pro": {"input": 1.25, "output": 10.00},
+    "gemini-2.5-flash": {"input": 0.30, "output": 2.50},
+    "gemini-2.5-flash-lite": {"input": 0.10, "output": 0.40},
+    "gemini-2.5-pro-preview-tts": {"input": 1.00, "output": 20.00},
+    "gemini-2.5-flash-preview-tts": {"input": 0.50, "output": 10.00},
+}
+
+# Cheaper fallbacks used when the budget is tight
+MODEL_DOWNGRADES = {
+    "gemini-2.5-pro": "gemini-2.5-flash",
+    "gemini-2.5-flash": "gemini-2.5-flash-lite",
+    "gemini-2.5-pro-preview-tts": "gemini-2.5-flash-preview-tts",
+}
+
+# Audio output is billed at 25 tokens per second
+AUDIO_TOKENS_PER_SECOND = 25
+
+# Typical token counts for one episode's text, one translation and one audio
+# rendering, used until real usage has been observed
+DEFAULT_EPISODE_USAGE = {
+    "text": {"input": 1500, "output": 2000},
+    "translation": {"input": 2500, "output": 3000},
+    "audio": {"input": 1800, "output": 600 * AUDIO_TOKENS_PER_SECOND},
+}
+
+USAGE_LOG_NAME = "usage-log.jsonl"
+
+
+def call_cost(model, input_tokens, output_tokens):
+    """Price a single call in USD (unknown models are priced at zero)"""
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        return 0.0
+    return (input_tokens * pricing["input"] + output_tokens * pricing["output"]) / 1_000_000
+
+
+def _budget_from_env(name):
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+
+class UsageTracker:
+    """Per-call usage records for the current run, mirrored to the run log"""
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+        self.run_started = datetime.now().isoformat()
+        self.records = []
+        self.episode_records = []
+        self.episode_index = 0
+        self._lock = threading.Lock()
+
+    def start_episode(self):
+        """Begin collecting records for a new episode"""
+        self.episode_records = []
+        self.episode_index += 1
+
+    def record(self, stage, model, usage_metadata, audio_seconds=None, variant=None):
+        """Record one call from its usage_metadata and return the record.
+
+        Calls made for an episode variant (another voice or language) are tagged with it.
+        """
+        input_tokens = getattr(usage_metadata, "prompt_token_count", None) or 0
+        output_tokens = (
+            (getattr(usage_metadata, "candidates_token_count", None) or 0)
+            + (getattr(usage_metadata, "thoughts_token_count", None) or 0)
+        )
+        if not output_tokens and audio_seconds:
+            # Usage not reported: fall back to the billed audio token rate
+            output_tokens = round(audio_seconds * AUDIO_TOKENS_PER_SECOND)
+
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "run_started": self.run_started,
+            "stage": stage,
+            "model": model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "audio_seconds": round(audio_seconds, 2) if audio_seconds is not None else None,
+            "cost_usd": round(call_cost(model, input_tokens, output_tokens), 6),
+            "episode": self.episode_index,
+        }
+        if variant:
+            record["variant"] = variant
+
+        # TTS groups of one episode are recorded from several threads
+        with self._lock:
+            self.records.append(record)
+            self.episode_records.append(record)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+        print(
+            f"💰 {stage}{f' [{variant}]' if variant else ''}: {input_tokens} in / {output_tokens} out tokens"
+            f" on {model} (${record['cost_usd']:.4f})"
+        )
+        return record
+
+    def episode_summary(self, variant=None, stage=None):
+        """Usage block stored in an episode's (or episode variant's) metadata.json, optionally for one stage"""
+        with self._lock:
+            records = [
+                r for r in self.episode_records
+                if r.get("variant") == variant and (stage is None or r["stage"] == stage)
+            ]
+        return {
+            "calls": records,
+            "input_tokens": sum(r["input_tokens"] for r in records),
+            "output_tokens": sum(r["output_tokens"] for r in records),
+            "audio_seconds": round(sum(r["audio_seconds"] or 0 for r in records), 2),
+            "cost_usd": round(sum(r["cost_usd"] for r in records), 6),
+        }
+
+    def run_cost(self):
+        """Spend so far in this run"""
+        return sum(r["cost_usd"] for r in self.records)
+
+    def daily_cost(self, day=None):
+        """Spend recorded in the run log for a calendar day (default: today)"""
+        day = (day or date.today()).isoformat()
+        if not self.log_path.exists():
+            return 0.0
+        total = 0.0
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("timestamp", "").startswith(day):
+                    total += record.get("cost_usd", 0.0)
+        return total
+
+    def average_usage(self, stage):
+        """Mean tokens per episode (or per variant) for a stage in this run, or the default estimate"""
+        with self._lock:
+            records = [r for r in self.records if r["stage"] == stage]
+        if not records:
+            return DEFAULT_EPISODE_USAGE[stage]
+        # Variant renderings and translations are counted separately from the main episode
+        renderings = len({(r["episode"], r.get("variant")) for r in records})
+        return {
+            "input": sum(r["input_tokens"] for r in records) / renderings,
+            "output": sum(r["output_tokens"] for r in records) / renderings,
+        }
+
+
+class BudgetScheduler:
+    """Decides how each prompt is processed given the remaining budget"""
+
+    PROCEED = "proceed"
+    DOWNGRADE = "downgrade"
+    DEFER = "defer"
+    STOP = "stop"
+
+    # Low-priority prompts only run while this many episodes' worth of budget remains
+    LOW_PRIORITY_HEADROOM = 2
+
+    def __init__(self, tracker, run_budget=None, daily_budget=None):
+        self.tracker = tracker
+        self.run_budget = run_budget if run_budget is not None else _budget_from_env("RUN_BUDGET_USD")
+        self.daily_budget = daily_budget if daily_budget is not None else _budget_from_env("DAILY_BUDGET_USD")
+        self._daily_spent_before_run = tracker.daily_cost() if self.daily_budget is not None else 0.0
+
+    def remaining(self):
+        """Remaining budget in USD across the run and daily limits (None if unlimited)"""
+        limits = []
+        if self.run_budget is not None:
+            limits.append(self.run_budget - self.tracker.run_cost())
+        if self.daily_budget is not None:
+            limits.append(self.daily_budget - self._daily_spent_before_run - self.tracker.run_cost())
+        return min(limits) if limits else None
+
+    def estimate_episode_cost(self, text_model, tts_model, renderings=1, translations=0, text=True):
+        """Projected cost of one episode with the given models.
+
+        renderings counts audio renderings (the episode plus its variants),
+        translations the languages it is translated into; text=False is for
+        work that reuses a saved script (rerender, variants).
+        """
+        total = 0.0
+        for stage, model, calls in (
+            ("text", text_model, 1 if text else 0),
+            ("translation", text_model, translations),
+            ("audio", tts_model, renderings),
+        ):
+            if calls:
+                usage = self.tracker.average_usage(stage)
+                total += calls * call_cost(model, usage["input"], usage["output"])
+        return total
+
+    def decide(self, priority, text_model, tts_model, renderings=1, translations=0, text=True):
+        """Return (decision, text_model, tts_model) for the next prompt (see estimate_episode_cost)"""
+        remaining = self.remaining()
+        if remaining is None:
+            return self.PROCEED, text_model, tts_model
+
+        work = {"renderings": renderings, "translations": translations, "text": text}
+        estimate = self.estimate_episode_cost(text_model, tts_model, **work)
+        if priority == "low" and remaining < estimate * self.LOW_PRIORITY_HEADROOM:
+            return self.DEFER, text_model, tts_model
+        if remaining >= estimate:
+            return self.PROCEED, text_model, tts_model
+
+        cheaper_text = MODEL_DOWNGRADES.get(text_model, text_model)
+        cheaper_tts = MODEL_DOWNGRADES.get(tts_model, tts_model)
+        if (cheaper_text, cheaper_tts) != (text_model, tts_model):
+            if remaining >= self.estimate_episode_cost(cheaper_text, cheaper_tts, **work):
+                return self.DOWNGRADE, cheaper_text, cheaper_tts
+        return self.STOP, text_model, tts_model